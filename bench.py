@@ -0,0 +1,401 @@
+''' Times the hot paths of the game on fixed boards with fixed seeds, so that two runs on the same machine can be compared.
+    Usage examples:
+        python bench.py                         # run everything, write bench_output.txt and compare it against bench_baseline.json
+        python bench.py --size expert --size max --repeat 20
+        python bench.py --save-baseline         # run everything and store the results as the new baseline
+
+    Every board size in SIZES gets the same benchmarks, each timed `repeat` times from the same starting position:
+        firstClick   generating the mines (seededMines(), the default mineGenerator) and opening the first click
+        whitespace   opening every whitespace region of the board one click at a time, starting from a board with nothing opened
+        chord        auto tile opening on: flagging the last mine, then double-clicking every tile that changed until the board is won
+        powerChord   the same with power double-clicking on as well, where flagging the last mine opens the whole board by itself
+        render       drawing every tile of a finished board to an offscreen surface, the way Gameboard.drawTiles() does
+        reset        Engine.reset() and drawing the hidden board in a window-sized Viewport, the way Gameboard.newGame() does
+        zoom         drawing a window-sized Viewport at every zoom level, in level of detail mode below viewport.LOD_TILESIZE
+        gameOver     showing the mines of a lost game in a window-sized Viewport, the way Gameboard.gameOver() does
+        startup      a cold start: `python -m minesweeper --endurance ROWS COLS MINES --first-frame` in a new process, from nothing
+                     to the board's first frame (at the endurance tile size of 20), counting the interpreter, imports and assets
+    Boards that would need a surface too big to allocate (see MAX_SURFACE_PIXELS) skip the render benchmark.
+
+    The results are written as JSON (median, minimum and mean milliseconds per benchmark) and compared against a stored baseline:
+    a benchmark whose fastest run is more than its threshold slower than the baseline's is a regression, and the exit status is 1.
+    The fastest run is compared rather than the median because it is the one the rest of the machine disturbed the least.
+    Machines (virtual ones especially) can run slower for seconds at a time, and a whole process can stay slower than the next one,
+    so a regression is timed again in a new process up to --retries times, and only reported if it is still slower every time.
+    Timings only mean something next to timings from the same machine, so the baseline should be saved on the hardware being checked.
+    This runs with SDL's dummy video driver, so it needs no display'''
+import argparse, json, os, platform, statistics, subprocess, sys, tempfile, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import numpy as np
+import pygame
+from minesweeper.engine import Engine, WHITESPACE, MINE, WON
+from minesweeper.atlas import TileAtlas
+from minesweeper.renderer import Renderer
+from minesweeper.viewport import Viewport, ZOOM_LEVELS
+
+# name -> (numRows, numCols, numMines, tilesize). The first 3 are the difficulty menu's, then the largest board the Custom menu allows
+# and boards past its limits, all at about the density of Expert
+SIZES = {
+    'beginner': (10, 10, 15, 28),
+    'intermediate': (15, 27, 80, 28),
+    'expert': (24, 30, 155, 28),
+    'max': (50, 99, 1000, 15),
+    'oversized': (200, 300, 12500, 15),
+}
+SEED = 1989
+BENCHMARKS = ['firstClick', 'whitespace', 'chord', 'powerChord', 'render', 'reset', 'zoom', 'gameOver', 'startup']
+WINDOW = (1000, 700)  # the size of the viewport in the drawing benchmarks
+MAX_SURFACE_PIXELS = 50000000
+
+# the default results files are kept next to this file, wherever it is run from
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_output.txt')
+# how much slower than the baseline the fastest run may be before it counts as a regression: drawing is noisier than the Engine
+THRESHOLDS = {'render': 0.5, 'reset': 0.5, 'gameOver': 0.5, 'startup': 0.5}
+# benchmarks too slow to run as many times as the others, whatever the size
+MAX_REPEAT = {'startup': 5}
+DEFAULT_THRESHOLD = 0.25
+# differences smaller than this are timer noise, whatever the ratio
+MIN_DIFFERENCE_MS = 0.1
+
+
+
+def newEngine(numRows, numCols, numMines): # the game every benchmark of a size starts from: the same seed, with the first click in the middle
+    engine = Engine(numRows, numCols, numMines)
+    engine.reset(seed=SEED)
+    return engine, (numRows // 2, numCols // 2)
+
+
+
+def blankSnapshot(engine): # the position right after the mines were placed, before the first click opened anything
+    return np.zeros_like(engine.board.state), engine.state, engine.numMines, engine.numRows * engine.numCols - engine.numMines, None
+
+
+
+def allFlagged(engine): # every mine flagged but one that is next to an opened number, with nothing opened but the first click
+    autoTileOpeningEnabled = engine.autoTileOpeningEnabled
+    engine.autoTileOpeningEnabled = False
+    lastMine = None
+    for row, col in zip(*(axis.tolist() for axis in np.nonzero(engine.board.numbers == MINE))):
+        if lastMine is None and any(engine.board.isOpened(i, j) for i, j in engine.neighbours(row, col)):
+            lastMine = (row, col)
+        else:
+            engine.flag(row, col)
+    engine.autoTileOpeningEnabled = autoTileOpeningEnabled
+    return engine.snapshot(), lastMine
+
+
+
+#######    BENCHMARKS    #######
+''' Each benchmark is a function (numRows, numCols, numMines, tilesize) that sets up its starting position once and returns
+    (setup, run): setup() puts the position back before every run and isn't timed, run() does the timed work.
+    run() returns the amount of tiles it opened or drew, so a change in what the game does shows up next to a change in speed.
+    A benchmark returns None if it doesn't apply to that size'''
+
+def firstClickBenchmark(numRows, numCols, numMines, tilesize):
+    engine, (row, col) = newEngine(numRows, numCols, numMines)
+
+    def setup():
+        engine.reset(seed=SEED)
+
+    def run():
+        return len(engine.firstClick(row, col))
+    return setup, run
+
+
+
+def whitespaceBenchmark(numRows, numCols, numMines, tilesize):
+    engine, (row, col) = newEngine(numRows, numCols, numMines)
+    engine.firstClick(row, col)
+    blank = blankSnapshot(engine)
+    whitespace = list(zip(*(axis.tolist() for axis in np.nonzero(engine.board.numbers == WHITESPACE))))
+
+    def setup():
+        engine.restore(blank)
+
+    def run():
+        opened = 0
+        for i, j in whitespace:
+            if not engine.board.isOpened(i, j):
+                opened += len(engine.reveal(i, j))
+        return opened
+    return setup, run
+
+
+
+def chordBenchmark(numRows, numCols, numMines, tilesize, powerDoubleclickEnabled=False):
+    engine, (row, col) = newEngine(numRows, numCols, numMines)
+    engine.firstClick(row, col)
+    engine.autoTileOpeningEnabled = True
+    engine.powerDoubleclickEnabled = powerDoubleclickEnabled
+    flagged, lastMine = allFlagged(engine)
+
+    def setup():
+        engine.restore(flagged)
+
+    def run():
+        # without power double-clicking, flagging the last mine only opens around the numbers next to it: double-click
+        # every tile that was opened after that, like a player would, until there is nothing left to open
+        changedTiles = engine.flag(*lastMine)
+        opened = len(changedTiles) - 1
+        while changedTiles and engine.state != WON:
+            newTiles = []
+            for i, j in changedTiles:
+                newTiles += engine.chord(i, j)
+            opened += len(newTiles)
+            changedTiles = newTiles
+        return opened
+    return setup, run
+
+
+
+def powerChordBenchmark(numRows, numCols, numMines, tilesize):
+    return chordBenchmark(numRows, numCols, numMines, tilesize, True)
+
+
+
+def drawingSetup(numRows, numCols, tilesize): # an offscreen surface for the whole board, and a TileAtlas converted to its pixel format
+    if numRows * numCols * tilesize * tilesize > MAX_SURFACE_PIXELS:
+        return None, None
+    surface = pygame.Surface((numCols * tilesize, numRows * tilesize)).convert()
+    atlas = TileAtlas()
+    atlas.setTilesize(tilesize)
+    return surface, atlas
+
+
+
+def renderBenchmark(numRows, numCols, numMines, tilesize):
+    surface, atlas = drawingSetup(numRows, numCols, tilesize)
+    if surface is None:
+        return None
+    engine, (row, col) = newEngine(numRows, numCols, numMines)
+    engine.firstClick(row, col)
+    engine.autoTileOpeningEnabled = engine.powerDoubleclickEnabled = True
+    flagged, lastMine = allFlagged(engine)
+    engine.restore(flagged)
+    engine.flag(*lastMine)
+    board = engine.board
+    tiles = [(i, j) for i in range(numRows) for j in range(numCols)]
+    renderer = Renderer()
+
+    def setup():
+        renderer.dirtyRects = []
+
+    def run():
+        for i, j in tiles:
+            renderer.markDirty(surface.blit(atlas.tile(board, i, j), (j * tilesize, i * tilesize)))
+        return len(tiles)
+    return setup, run
+
+
+
+def viewportSetup(numRows, numCols, tilesize): # a window-sized surface, a Viewport of a board in it and a TileAtlas for it
+    width, height = min(numCols * tilesize, WINDOW[0]), min(numRows * tilesize, WINDOW[1])
+    surface = pygame.Surface((width, height)).convert()
+    atlas = TileAtlas()
+    atlas.setTilesize(tilesize)
+    return surface, Viewport(numRows, numCols, tilesize, width, height), atlas
+
+
+
+def resetBenchmark(numRows, numCols, numMines, tilesize):
+    surface, viewport, atlas = viewportSetup(numRows, numCols, tilesize)
+    engine, (row, col) = newEngine(numRows, numCols, numMines)
+
+    def setup():
+        engine.firstClick(row, col)
+
+    def run():
+        engine.reset(numRows, numCols, numMines, SEED)
+        viewport.draw(surface, atlas, engine.board)
+        return viewport.numVisible()
+    return setup, run
+
+
+
+def zoomBenchmark(numRows, numCols, numMines, tilesize):
+    surface, viewport, atlas = viewportSetup(numRows, numCols, tilesize)
+    engine, (row, col) = newEngine(numRows, numCols, numMines)
+    engine.firstClick(row, col)
+    # the atlas is rendered at every size beforehand: rendering it again is what changing the zoom costs, not drawing
+    atlases = {}
+    for level in ZOOM_LEVELS:
+        atlases[level] = TileAtlas()
+        atlases[level].setTilesize(level)
+
+    def setup():
+        viewport.setTilesize(tilesize)
+
+    def run():
+        drawn = 0
+        while viewport.zoom(-1, viewport.width // 2, viewport.height // 2):
+            viewport.draw(surface, atlases.get(viewport.tilesize), engine.board)
+            drawn += viewport.numVisible()
+        return drawn
+    return setup, run
+
+
+
+def gameOverBenchmark(numRows, numCols, numMines, tilesize):
+    surface, viewport, atlas = viewportSetup(numRows, numCols, tilesize)
+    engine, (row, col) = newEngine(numRows, numCols, numMines)
+    engine.firstClick(row, col)
+    snapshot, lastMine = allFlagged(engine)
+    engine.reveal(*lastMine)
+
+    def setup():
+        viewport.draw(surface, atlas, engine.board)
+
+    def run():
+        return viewport.drawGameOver(surface, atlas, engine.board, engine.mineLocations, False, lastMine)
+    return setup, run
+
+
+
+def startupBenchmark(numRows, numCols, numMines, tilesize):
+    command = [sys.executable, '-m', 'minesweeper', '--endurance', str(numRows), str(numCols), str(numMines), '--first-frame']
+
+    def setup():
+        pass
+
+    def run():
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        return 0  # what it drew is in another process
+    return setup, run
+
+
+
+FUNCTIONS = {'firstClick': firstClickBenchmark, 'whitespace': whitespaceBenchmark, 'chord': chordBenchmark,
+             'powerChord': powerChordBenchmark, 'render': renderBenchmark, 'reset': resetBenchmark, 'zoom': zoomBenchmark,
+             'gameOver': gameOverBenchmark, 'startup': startupBenchmark}
+
+
+
+def timeBenchmark(benchmark, size, repeat): # the results of one benchmark on one size, or None if it doesn't apply to that size
+    prepared = benchmark(*SIZES[size])
+    if prepared is None:
+        return None
+    setup, run = prepared
+    setup()
+    run()  # a run that isn't timed, so the first timed one doesn't pay for cold caches
+    times, tiles = [], None
+    for i in range(repeat):
+        setup()
+        start = time.perf_counter()
+        tiles = run()
+        times.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'mean_ms': statistics.fmean(times), 'runs': repeat, 'tiles': tiles}
+
+
+
+def initDisplay(): # the atlas' surfaces are converted to the display's pixel format, so there has to be one
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+
+
+
+def timeAgain(size, name, repeat): # run one benchmark in a new process, and return its results
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'output.json')
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--size', size, '--benchmark', name, '--repeat', str(repeat),
+                        '--output', output, '--no-compare'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        with open(output) as file:
+            return json.load(file)['results']['%s/%s' % (size, name)]
+
+
+
+def sizeRepeat(size, repeat): # the bigger boards get fewer runs, so that every size takes roughly as long
+    numRows, numCols = SIZES[size][:2]
+    return max(3, min(repeat, repeat * 10000 // (numRows * numCols)))
+
+
+
+def runBenchmarks(sizes, benchmarks, repeat):
+    results = {}
+    for size in sizes:
+        for name in benchmarks:
+            result = timeBenchmark(FUNCTIONS[name], size, min(sizeRepeat(size, repeat), MAX_REPEAT.get(name, repeat)))
+            if result is not None:
+                results['%s/%s' % (size, name)] = result
+                print('%-24s %10.3f ms  (min %.3f, %d runs, %d tiles)' % ('%s/%s' % (size, name), result['median_ms'], result['min_ms'], result['runs'], result['tiles']))
+
+    return {'seed': SEED, 'python': platform.python_version(), 'pygame': pygame.version.ver, 'numpy': np.__version__,
+            'machine': platform.machine(), 'sizes': {size: SIZES[size] for size in sizes}, 'results': results}
+
+
+
+def compare(output, baseline, threshold=None, names=None): # print how the results compare to the baseline, and return the names of the regressions
+    regressions = []
+    for name in names or output['results']:
+        result, old = output['results'][name], baseline['results'].get(name)
+        if old is None:
+            print('%-24s no baseline' % name)
+            continue
+        if old['tiles'] != result['tiles']:  # the same seed opened different tiles: the game itself changed, not only its speed
+            print('%-24s went through %d tiles, the baseline went through %d' % (name, result['tiles'], old['tiles']))
+        allowed = threshold if threshold is not None else THRESHOLDS.get(name.split('/')[1], DEFAULT_THRESHOLD)
+        ratio = result['min_ms'] / old['min_ms'] if old['min_ms'] else 1
+        regressed = ratio > 1 + allowed and result['min_ms'] - old['min_ms'] > MIN_DIFFERENCE_MS
+        print('%-24s %10.3f ms  baseline %10.3f ms  %+7.1f%%%s' % (name, result['min_ms'], old['min_ms'], (ratio - 1) * 100, '  REGRESSION' if regressed else ''))
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the hot paths of the game on fixed boards.')
+    parser.add_argument('--size', action='append', choices=list(SIZES), help='a board size to run (repeatable, default: all of them)')
+    parser.add_argument('--benchmark', action='append', choices=BENCHMARKS, help='a benchmark to run (repeatable, default: all of them)')
+    parser.add_argument('--repeat', type=int, default=30, help='runs per benchmark on the smallest boards (default: 30)')
+    parser.add_argument('--output', default=OUTPUT, help='where to write the results as JSON (default: %s next to this file)' % os.path.basename(OUTPUT))
+    parser.add_argument('--baseline', default=BASELINE, help='the results to compare against (default: %s next to this file)' % os.path.basename(BASELINE))
+    parser.add_argument('--threshold', type=float, help='the allowed slowdown for every benchmark, e.g. 0.25 for 25%%')
+    parser.add_argument('--retries', type=int, default=4, help='how many times to time a regression again before reporting it (default: 4)')
+    parser.add_argument('--no-compare', action='store_true', help='only write the results')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline instead of comparing')
+    args = parser.parse_args()
+
+    initDisplay()
+    output = runBenchmarks(args.size or list(SIZES), args.benchmark or BENCHMARKS, args.repeat)
+    with open(args.output, 'w') as file:
+        json.dump(output, file, indent=1)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(output, file, indent=1)
+        print('saved the baseline to %s' % args.baseline)
+        return 0
+    if args.no_compare:
+        return 0
+    if not os.path.exists(args.baseline):
+        print('no baseline at %s: run with --save-baseline to make one' % args.baseline)
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    print()
+    regressions = compare(output, baseline, args.threshold)
+    for attempt in range(args.retries):
+        if not regressions:
+            break
+        print('\ntiming %d regression%s again' % (len(regressions), '' if len(regressions) == 1 else 's'))
+        for name in regressions:
+            size, benchmark = name.split('/')
+            result = timeAgain(size, benchmark, args.repeat)
+            if result['min_ms'] < output['results'][name]['min_ms']:
+                output['results'][name] = result
+        regressions = compare(output, baseline, args.threshold, regressions)
+    with open(args.output, 'w') as file:
+        json.dump(output, file, indent=1)
+
+    if regressions:
+        print('%d regression%s: %s' % (len(regressions), '' if len(regressions) == 1 else 's', ', '.join(regressions)))
+        return 1
+    print('no regressions')
+    return 0
+
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,4 @@
+''' Minesweeper, played with `python -m minesweeper` (or the `minesweeper` command once installed).
+    The rules live in engine.py, with no pygame in it or in anything it imports, so bots and tools can import the game logic
+    (minesweeper.engine, minesweeper.batch, minesweeper.solver...) as often as they like without a display or a window.
+    Only minesweeper.game, the pygame front end, starts pygame, and only once its main() is called'''
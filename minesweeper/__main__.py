@@ -0,0 +1,5 @@
+from .game import main
+
+# python -m minesweeper
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import os
+import pygame
+from functools import lru_cache
+from .engine import WHITESPACE
+
+# the colors of the numbers on opened tiles, index 0 is whitespace
+NUMBER_COLORS = [(95, 104, 234), (95, 104, 234), (61, 166, 66), (217, 72, 66), (67, 72, 170), (138, 0, 198), (104, 73, 0), (50, 50, 50), (0, 0, 0)]
+# the images are part of the package, wherever it is run from
+IMAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+
+
+
+@lru_cache(maxsize=None)
+def loadImage(name): # the original images are large, so each one is only loaded the first time a tile needs it, then kept for every tile size
+    return pygame.image.load(os.path.join(IMAGES, name + '.png'))
+
+
+
+''' Every tile the gameboard can show, pre-rendered at the current tile size so drawing a tile is a single blit.
+    Each kind of tile is a list of 2 surfaces indexed by checkerboard shade, (row + col) % 2, where 1 is the darker shade:
+    .numbers[shade][n] is an opened tile showing n (0 for whitespace), and .hidden, .yellowFlags, .greenFlags and .blueMines work the same way.
+    .kinds holds them all in the order of the tile kinds in board.py, so a Viewport can go straight from a kind to a surface.
+    The surfaces are only rendered again when setTilesize() is given a different size than last time'''
+class TileAtlas():
+    def __init__(self):
+        # nothing is loaded or rendered until the first game sets the tile size, so the menus come up without waiting on the images
+        self.tilesize = None
+
+
+
+    def setTilesize(self, tilesize): # must be called after the display mode is set, since the surfaces are converted to the display's pixel format
+        if tilesize == self.tilesize:
+            return
+        self.tilesize = tilesize
+
+        def scale(image):
+            return pygame.transform.scale(image, (tilesize, tilesize)).convert_alpha()
+
+        self.redMine = scale(loadImage('mine_red'))
+        self.blueMines = [scale(loadImage('mine_light_blue')), scale(loadImage('mine_dark_blue'))]
+        self.greenFlags = [scale(loadImage('flag_light_green')), scale(loadImage('flag_dark_green'))]
+        self.yellowFlags = [scale(loadImage('flag_light_yellow')), scale(loadImage('flag_dark_yellow'))]
+
+        self.hidden = []
+        for color in ((104, 113, 255), (100, 108, 248)):
+            tile = pygame.Surface((tilesize, tilesize)).convert()
+            tile.fill(color)
+            self.hidden.append(tile)
+
+        # render the numbers once, centered on a tile of each opened shade
+        font = pygame.font.SysFont('Lucida Grande', int(tilesize / 1.1))
+        self.numbers = []
+        for color in ((251, 250, 251), (245, 245, 245)):
+            shadeNumbers = []
+            for number, numberColor in enumerate(NUMBER_COLORS):
+                tile = pygame.Surface((tilesize, tilesize)).convert()
+                tile.fill(color)
+                if number:
+                    txt = font.render(str(number), True, numberColor)
+                    txtRect = txt.get_rect()
+                    txtRect.center = (int(tilesize * .5), int(tilesize * .5))
+                    tile.blit(txt, txtRect)
+                shadeNumbers.append(tile)
+            self.numbers.append(shadeNumbers)
+
+        self.kinds = [self.hidden, self.yellowFlags] + [[self.numbers[0][number], self.numbers[1][number]] for number in range(len(NUMBER_COLORS))]
+        self.kinds += [self.blueMines, self.greenFlags, [self.redMine, self.redMine]]
+
+
+
+    def tile(self, board, row, col): # the surface that shows a tile of a game being played: a flag, a hidden tile, or an opened number
+        shade = (row + col) % 2
+        if board.isFlagged(row, col):
+            return self.yellowFlags[shade]
+        elif not board.isOpened(row, col):
+            return self.hidden[shade]
+        number = board.numbers[row, col]
+        return self.numbers[shade][0 if number == WHITESPACE else number]
@@ -0,0 +1,188 @@
+import numpy as np
+from .board import OPENED, FLAGGED
+from .engine import WHITESPACE, MINE, NOT_STARTED, PLAYING, LOST, WON
+from .generation import seededMines, fillNumbers
+
+# BatchEngine.step() actions: the same as Gameboard.mouseClick()'s buttons, plus IDLE for boards that sit a step out
+IDLE, REVEAL, CHORD, FLAG = 0, 1, 2, 3
+
+# the tiles surrounding a tile, in the order Engine.neighbours() goes through them: a chord explodes on the first misplaced flag in this order
+NEIGHBOUR_OFFSETS = np.array([(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if (i, j) != (0, 0)])
+
+
+
+def dilate(mask): # every tile of a stack of boards that is in mask or surrounds a tile in mask
+    grown = mask.copy()
+    grown[:, 1:, :] |= mask[:, :-1, :]
+    grown[:, :-1, :] |= mask[:, 1:, :]
+    columns = grown.copy()
+    grown[:, :, 1:] |= columns[:, :, :-1]
+    grown[:, :, :-1] |= columns[:, :, 1:]
+    return grown
+
+
+
+''' numBoards games of the same difficulty, played side by side: every board is one layer of a numBoards x numRows x numCols array,
+    and step() makes one move on every board at once with array operations, so a move costs a handful of Python calls for the whole batch
+    instead of one Engine call per game. Bots that play huge amounts of games spend their time on the rules instead of on the interpreter.
+
+    The rules are the Engine's, and a board given the same seed and the same moves ends up exactly like an Engine game would:
+    the first click generates the mines with the same mineGenerator, whitespace cascades open the same tiles, and a chord over a misplaced flag
+    opens the same tiles before exploding. Power double-click and automatic tile opening aren't supported.
+    Cascades are done for every board at once by growing the whitespace regions one tile in every direction per iteration, so one takes
+    as many iterations as the longest path through the whitespace opened, on the boards that are still cascading.
+
+    .numbers and .boardState are the stacked Board.numbers and Board.state arrays (.boardState doesn't keep the flag counts in the high bits).
+    .state, .numMinesRemaining, .numTilesRemaining, .seed, .firstClickTile and .explodedTile hold the Engine attribute of every board,
+    with (-1, -1) for tiles that don't exist yet'''
+class BatchEngine():
+    def __init__(self, numBoards, numRows, numCols, numMines):
+        self.numBoards = numBoards
+        self.numRows = numRows
+        self.numCols = numCols
+        self.numMines = numMines
+        self.rng = np.random.default_rng()  # only draws the seeds of games that aren't given one
+        self.mineGenerator = seededMines
+
+        self.numbers = np.zeros((numBoards, numRows, numCols), dtype=np.int8)
+        self.boardState = np.zeros((numBoards, numRows, numCols), dtype=np.uint8)
+        self.state = np.zeros(numBoards, dtype=np.uint8)
+        self.numMinesRemaining = np.zeros(numBoards, dtype=np.int64)
+        self.numTilesRemaining = np.zeros(numBoards, dtype=np.int64)
+        self.seed = np.zeros(numBoards, dtype=np.int64)
+        self.firstClickTile = np.zeros((numBoards, 2), dtype=np.int64)
+        self.explodedTile = np.zeros((numBoards, 2), dtype=np.int64)
+        self.reset()
+
+
+
+    def reset(self, boards=None, seeds=None): # start new games on the given boards (indices or a boolean mask, all of them by default)
+        boards = np.arange(self.numBoards) if boards is None else np.flatnonzero(boards) if np.asarray(boards).dtype == bool else np.asarray(boards)
+        self.boardState[boards] = 0  # the numbers are all written by start(), like Board.reset()
+        self.state[boards] = NOT_STARTED
+        self.numMinesRemaining[boards] = self.numMines
+        self.numTilesRemaining[boards] = self.numRows * self.numCols - self.numMines
+        self.seed[boards] = seeds if seeds is not None else self.rng.integers(1 << 63, size=len(boards))
+        self.firstClickTile[boards] = -1
+        self.explodedTile[boards] = -1
+
+
+
+    def finished(self): # a boolean array of the boards whose game is over
+        return self.state >= LOST
+
+
+
+    def step(self, actions, rows, cols):
+        ''' Make one move on every board: actions[k] (IDLE, REVEAL, CHORD or FLAG) on tile (rows[k], cols[k]) of board k.
+            Moves the Engine would ignore (off the board, on a finished game, revealing a flag...) are ignored here too.
+            Returns a numBoards x numRows x numCols boolean array of the tiles whose opened/flagged state changed'''
+        actions, rows, cols = np.asarray(actions), np.asarray(rows), np.asarray(cols)
+        boards = np.arange(self.numBoards)
+        onBoard = (rows >= 0) & (rows < self.numRows) & (cols >= 0) & (cols < self.numCols)
+        rows, cols = np.where(onBoard, rows, 0), np.where(onBoard, cols, 0)
+        tileState = self.boardState[boards, rows, cols]
+        notOver = onBoard & (self.state <= PLAYING)
+        changed = np.zeros(self.boardState.shape, dtype=bool)
+        opening = np.zeros(self.boardState.shape, dtype=bool)
+
+        # single left-clicks. The first one of a game places the mines first
+        reveal = (actions == REVEAL) & notOver & (tileState & (OPENED | FLAGGED) == 0)
+        first = np.flatnonzero(reveal & (self.state == NOT_STARTED))
+        if len(first):
+            self.start(first, rows[first], cols[first])
+        tileNumbers = self.numbers[boards, rows, cols]
+        exploded = reveal & (tileNumbers == MINE)
+        self.explode(exploded, rows, cols)
+        opening[boards[reveal & ~exploded], rows[reveal & ~exploded], cols[reveal & ~exploded]] = True
+
+        # double-clicks on satisfied numbers open every unflagged surrounding tile, up to the first mine if a flag was misplaced
+        chord = (actions == CHORD) & onBoard & (self.state == PLAYING) & (tileState & (OPENED | FLAGGED) == OPENED) & (tileNumbers >= 1) & (tileNumbers <= 8)
+        if chord.any():
+            self.chord(np.flatnonzero(chord), rows[chord], cols[chord], opening)
+
+        # right-clicks
+        flag = (actions == FLAG) & notOver & (tileState & OPENED == 0)
+        if flag.any():
+            self.boardState[boards[flag], rows[flag], cols[flag]] ^= FLAGGED
+            self.numMinesRemaining[flag] += np.where(tileState[flag] & FLAGGED, 1, -1)
+            changed[boards[flag], rows[flag], cols[flag]] = True
+
+        if opening.any():
+            self.openTiles(opening, changed)
+        return changed
+
+
+
+    def start(self, boards, rows, cols): # the first click of these boards: generate their mines (one call per board, only once per game)
+        boardSize = self.numRows * self.numCols
+        mines = [self.mineGenerator(self.numRows, self.numCols, self.numMines, row, col, seed) + i * boardSize
+                 for i, (row, col, seed) in enumerate(zip(rows.tolist(), cols.tolist(), self.seed[boards].tolist()))]
+        numbers = np.zeros((len(boards), self.numRows, self.numCols), dtype=np.int8)
+        fillNumbers(numbers, np.concatenate(mines))
+        self.numbers[boards] = numbers
+        self.firstClickTile[boards] = np.stack([rows, cols], axis=1)
+        self.state[boards] = PLAYING
+
+
+
+    def chord(self, boards, rows, cols, opening): # Engine.chordOnce() on one tile of each of the given boards, marking what to open in opening
+        neighbourRows, neighbourCols = rows[:, None] + NEIGHBOUR_OFFSETS[:, 0], cols[:, None] + NEIGHBOUR_OFFSETS[:, 1]
+        exists = (neighbourRows >= 0) & (neighbourRows < self.numRows) & (neighbourCols >= 0) & (neighbourCols < self.numCols)
+        neighbourRows, neighbourCols = np.where(exists, neighbourRows, 0), np.where(exists, neighbourCols, 0)
+        neighbourState = self.boardState[boards[:, None], neighbourRows, neighbourCols]
+        neighbourNumbers = self.numbers[boards[:, None], neighbourRows, neighbourCols]
+
+        # only satisfied numbers can be double-clicked: exactly that many flags around them
+        satisfied = (exists & (neighbourState & FLAGGED != 0)).sum(axis=1) == self.numbers[boards, rows, cols]
+        boards, neighbourRows, neighbourCols = boards[satisfied], neighbourRows[satisfied], neighbourCols[satisfied]
+        closed = (exists & (neighbourState & (OPENED | FLAGGED) == 0))[satisfied]
+        mines = closed & (neighbourNumbers[satisfied] == MINE)
+
+        # everything up to the first mine (in Engine.neighbours() order) is opened, then the first mine explodes
+        firstMine = np.where(mines.any(axis=1), mines.argmax(axis=1), len(NEIGHBOUR_OFFSETS))
+        opened = closed & (np.arange(len(NEIGHBOUR_OFFSETS)) < firstMine[:, None])
+        opening[np.repeat(boards, opened.sum(axis=1)), neighbourRows[opened], neighbourCols[opened]] = True
+
+        lost = firstMine < len(NEIGHBOUR_OFFSETS)
+        exploded = np.zeros(self.numBoards, dtype=bool)
+        exploded[boards[lost]] = True
+        explodedRows, explodedCols = np.zeros(self.numBoards, dtype=np.int64), np.zeros(self.numBoards, dtype=np.int64)
+        explodedRows[boards[lost]] = neighbourRows[lost, firstMine[lost]]
+        explodedCols[boards[lost]] = neighbourCols[lost, firstMine[lost]]
+        self.explode(exploded, explodedRows, explodedCols)
+
+
+
+    def openTiles(self, opening, changed):
+        ''' Open the closed, unflagged tiles in opening, along with all whitespace connected to the whitespace among them and the numbers around it,
+            then mark the games whose last safe tile was opened as won. The whitespace regions of every cascading board grow together,
+            and a board drops out of the loop as soon as its region stops growing'''
+        boards = np.flatnonzero(opening.any(axis=(1, 2)))
+        opening, boardState = opening[boards], self.boardState[boards]
+        closed = boardState & (OPENED | FLAGGED) == 0
+        fillable = closed & (self.numbers[boards] == WHITESPACE)
+
+        region = opening & fillable
+        cascading = np.flatnonzero(region.any(axis=(1, 2)))
+        while len(cascading):
+            grown = dilate(region[cascading]) & fillable[cascading]
+            growing = (grown != region[cascading]).any(axis=(1, 2))
+            region[cascading] = grown
+            cascading = cascading[growing]
+
+        opened = (opening | dilate(region)) & closed
+        boardState[opened] |= OPENED
+        self.boardState[boards] = boardState
+        changed[boards] |= opened
+        self.numTilesRemaining[boards] -= opened.sum(axis=(1, 2))
+
+        won = (self.state == PLAYING) & (self.numTilesRemaining == 0)
+        self.state[won] = WON
+        self.numMinesRemaining[won] = 0
+
+
+
+    def explode(self, boards, rows, cols): # boards is a boolean mask, and rows and cols hold the exploded tile of each of them
+        self.state[boards] = LOST
+        self.explodedTile[boards] = np.stack([rows[boards], cols[boards]], axis=1)
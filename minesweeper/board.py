@@ -0,0 +1,81 @@
+import numpy as np
+from .generation import MINE
+
+# bits of Board.state: the low 3 bits are flags, the high 4 bits count the flags placed on the surrounding tiles (0 to 8)
+OPENED = 1
+FLAGGED = 2
+VISITED = 4   # used by the Engine to mark tiles it has already processed, e.g. by a power double-click
+FLAG_COUNT_SHIFT = 4
+FLAG_COUNT_UNIT = 1 << FLAG_COUNT_SHIFT
+
+# every kind of tile the board can show, as the player sees it: TileAtlas.kinds and viewport.LOD_COLORS are indexed by kind,
+# then by shade ((row + col) % 2), and the game server sends tiles to its clients as kinds
+HIDDEN, FLAG, NUMBER = 0, 1, 2   # NUMBER + n is an opened tile showing n, 0 for whitespace
+BLUE_MINE, GREEN_FLAG, RED_MINE = 11, 12, 13   # only shown once the game is over
+
+
+
+def tileKinds(numbers, state, gameOver=None):
+    ''' The kind of every tile of a block of the board, as an array of the same shape.
+        gameOver is None while the game is played, or (won, exploded): exploded is a boolean array of the block, True on the mine that ended the game.
+        Once the game is over unflagged mines are blue, flagged ones green (every mine is green if the game was won),
+        and misplaced flags stay yellow, just like while playing'''
+    kinds = np.where(state & OPENED != 0, NUMBER + np.maximum(numbers, 0), np.where(state & FLAGGED != 0, FLAG, HIDDEN))
+    if gameOver is not None:
+        won, exploded = gameOver
+        mines = numbers == MINE
+        flagged = state & FLAGGED != 0
+        kinds[mines & ~flagged] = GREEN_FLAG if won else BLUE_MINE
+        kinds[mines & flagged] = GREEN_FLAG
+        kinds[exploded] = RED_MINE
+    return kinds.astype(np.intp)
+
+
+
+''' The storage for one board: two numRows x numCols byte arrays instead of a grid of Python objects.
+    .numbers holds each tile's number (-1 whitespace, 1-8 surrounding mines, 9 mine)
+    and .state packs everything the player has done to that tile, so a whole board costs 2 bytes per tile and is reset in one step.
+    There is no maximum size: the arrays are only reallocated when the dimensions change'''
+class Board():
+    def __init__(self, numRows, numCols):
+        self.numRows = numRows
+        self.numCols = numCols
+        self.numbers = np.zeros((numRows, numCols), dtype=np.int8)
+        self.state = np.zeros((numRows, numCols), dtype=np.uint8)
+
+
+
+    def reset(self): # only .state is cleared: .numbers keeps the last game's numbers until the Engine places the mines, which writes every tile
+        self.state.fill(0)
+
+
+
+    def isOpened(self, row, col):
+        return bool(self.state[row, col] & OPENED)
+
+
+
+    def isFlagged(self, row, col):
+        return bool(self.state[row, col] & FLAGGED)
+
+
+
+    def amtSurroundingFlags(self, row, col):
+        return int(self.state[row, col] >> FLAG_COUNT_SHIFT)
+
+
+
+    def toggleFlag(self, row, col): # flag or unflag a tile, and update the flag count of its surrounding tiles. Returns True if a flag was placed
+        flagPlaced = not self.state[row, col] & FLAGGED
+        tileState = self.state[row, col] ^ FLAGGED
+
+        # add (or subtract) one flag to the whole 3x3 block in one step, then put the tile itself back since it doesn't surround itself.
+        # VISITED is cleared on the surrounding tiles because their double-click result may have changed
+        block = self.state[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2]
+        if flagPlaced:
+            block += FLAG_COUNT_UNIT
+        else:
+            block -= FLAG_COUNT_UNIT
+        block &= ~np.uint8(VISITED)
+        self.state[row, col] = tileState
+        return flagPlaced
@@ -0,0 +1,202 @@
+import numpy as np
+from collections import deque
+from functools import lru_cache
+from .board import OPENED, FLAGGED
+from .generation import WHITESPACE
+
+
+
+''' Opening whitespace: when a whitespace tile is opened, every whitespace tile connected to it is opened too, along with the numbers around them.
+    floodFill() does this one tile at a time with a queue, and scanlineFill() one row-run of whitespace at a time with array slices.
+    Both take the board's numbers and state arrays and return the (row, col) of every tile to open, each tile only once.
+    Tiles that are opened or flagged stop the cascade, just like when the user opens whitespace by clicking'''
+
+@lru_cache(maxsize=8)
+def neighbourOffsets(numRows, numCols):
+    ''' The flat index offsets (row * numCols + col) of the surrounding tiles, for every kind of position on the board.
+        A tile's kind is 4 bits: not in the top row, not in the bottom row, not in the left column, not in the right column.
+        Looking up the offsets for a tile's kind means the neighbours never have to be bounds-checked one by one'''
+    offsets = []
+    for kind in range(16):
+        kindOffsets = []
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                if (i, j) == (0, 0) or (i == -1 and not kind & 1) or (i == 1 and not kind & 2) or (j == -1 and not kind & 4) or (j == 1 and not kind & 8):
+                    continue
+                kindOffsets.append(i * numCols + j)
+        offsets.append(tuple(kindOffsets))
+    return tuple(offsets)
+
+
+
+def floodFill(numbers, state, row, col): # breadth-first search from (row, col): every tile is put on the queue at most once, so this is linear in the amount opened
+    numRows, numCols = numbers.shape
+    offsets = neighbourOffsets(numRows, numCols)
+    # reading single tiles from memoryviews of the arrays gives plain ints, which is much faster than indexing the arrays themselves,
+    # and unlike a copy of the arrays costs nothing up front, however big the board is
+    flatNumbers, flatState = memoryview(numbers.ravel()), memoryview(state.ravel())
+    lastRow, lastCol = numRows - 1, numCols - 1
+
+    start = row * numCols + col
+    revealed = {start}
+    whitespaceQueue = deque([start])
+
+    while whitespaceQueue:
+        index = whitespaceQueue.popleft()
+        if flatNumbers[index] != WHITESPACE:
+            continue
+
+        row, col = divmod(index, numCols)
+        for offset in offsets[(row > 0) | (row < lastRow) << 1 | (col > 0) << 2 | (col < lastCol) << 3]:
+            neighbour = index + offset
+            if neighbour in revealed or flatState[neighbour] & (OPENED | FLAGGED):
+                continue
+            revealed.add(neighbour)
+            if flatNumbers[neighbour] == WHITESPACE:
+                whitespaceQueue.append(neighbour)
+
+    return [divmod(index, numCols) for index in revealed]
+
+
+
+def scanlineFill(numbers, state, row, col):
+    ''' Opens the same tiles as floodFill(), but labels the whole whitespace region first, one horizontal run of whitespace at a time:
+        each run is filled with a single slice assignment, and the runs touching it in the rows above and below are found with array operations.
+        The numbers surrounding the region are then found in one step by growing the region by one tile in every direction'''
+    numRows, numCols = numbers.shape
+    if numbers[row, col] != WHITESPACE:
+        return [(row, col)]
+
+    fillable = (numbers == WHITESPACE) & (state & (OPENED | FLAGGED) == 0)
+    fillable[row, col] = True
+    region = np.zeros((numRows, numCols), dtype=bool)
+
+    # runStart[r, c] and runEnd[r, c] are the first and last column of the run of fillable tiles containing (r, c)
+    columns = np.broadcast_to(np.arange(numCols), (numRows, numCols))
+    runStart = np.maximum.accumulate(np.where(fillable, -1, columns), axis=1) + 1
+    runEnd = np.minimum.accumulate(np.where(fillable, numCols, columns)[:, ::-1], axis=1)[:, ::-1] - 1
+
+    seeds = [(row, col)]
+    while seeds:
+        r, c = seeds.pop()
+        if region[r, c]:
+            continue
+        left, right = runStart[r, c], runEnd[r, c]
+        region[r, left:right + 1] = True
+
+        # any unfilled run in the rows above and below that touches this run (diagonals included) is a new seed
+        lo, hi = max(left - 1, 0), min(right + 2, numCols)
+        for nextRow in (r - 1, r + 1):
+            if 0 <= nextRow < numRows:
+                candidates = fillable[nextRow, lo:hi] & ~region[nextRow, lo:hi]
+                # only the first tile of each run needs to be a seed
+                firstOfRun = candidates.copy()
+                firstOfRun[1:] &= ~candidates[:-1]
+                seeds.extend((nextRow, lo + c) for c in np.flatnonzero(firstOfRun).tolist())
+
+    # everything within one tile of the region (inside its bounding box) that isn't opened or flagged gets opened
+    rows, cols = np.flatnonzero(region.any(axis=1)), np.flatnonzero(region.any(axis=0))
+    top, bottom, left, right = max(rows[0] - 1, 0), min(rows[-1] + 2, numRows), max(cols[0] - 1, 0), min(cols[-1] + 2, numCols)
+    box = region[top:bottom, left:right]
+    grown = box.copy()
+    grown[1:, :] |= box[:-1, :]
+    grown[:-1, :] |= box[1:, :]
+    grown[:, 1:] |= grown[:, :-1].copy()
+    grown[:, :-1] |= grown[:, 1:].copy()
+    grown &= state[top:bottom, left:right] & (OPENED | FLAGGED) == 0
+    grown |= box
+
+    openRows, openCols = np.nonzero(grown)
+    return list(zip((openRows + top).tolist(), (openCols + left).tolist()))
+
+
+
+def labelWhitespace(numbers):
+    ''' Labels every connected whitespace region (diagonals connect too) with a number from 1 up, and everything else with 0.
+        Returns (labels, amount of regions). The whitespace is split into horizontal runs, runs in neighbouring rows that touch are joined
+        with a union-find, and the labels are painted back onto the board with array operations'''
+    numRows, numCols = numbers.shape
+    padded = np.zeros((numRows, numCols + 2), dtype=np.int8)
+    padded[:, 1:-1] = numbers == WHITESPACE
+    edges = np.diff(padded, axis=1)
+    runRows, runStarts = np.nonzero(edges == 1)
+    runEnds = np.nonzero(edges == -1)[1]   # one past the last column of each run, in the same (row by row) order as the starts
+    numRuns = len(runRows)
+
+    # find the parent of every run, joining runs in consecutive rows whose columns overlap or touch diagonally
+    parent = list(range(numRuns))
+    def root(run):
+        while parent[run] != run:
+            parent[run] = parent[parent[run]]
+            run = parent[run]
+        return run
+
+    rowStarts = np.searchsorted(runRows, np.arange(numRows + 1)).tolist()
+    starts, ends = runStarts.tolist(), runEnds.tolist()
+    for row in range(numRows - 1):
+        i, iEnd = rowStarts[row], rowStarts[row + 1]
+        j, jEnd = rowStarts[row + 1], rowStarts[row + 2]
+        while i < iEnd and j < jEnd:
+            if starts[i] <= ends[j] and starts[j] <= ends[i]:
+                a, b = root(i), root(j)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+            # move past whichever run finishes first: it can't touch anything further along the other row
+            if ends[i] < ends[j]:
+                i += 1
+            else:
+                j += 1
+
+    roots = np.array([root(run) for run in range(numRuns)], dtype=np.int64)
+    isRoot = roots == np.arange(numRuns)
+    runLabels = np.cumsum(isRoot)[roots]   # roots are always the lowest run of their region, so this numbers the regions 1, 2, 3, ...
+
+    lengths = runEnds - runStarts
+    cellRuns = np.repeat(np.arange(numRuns), lengths)
+    cellIndices = np.repeat(runRows * numCols + runStarts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    labels = np.zeros(numRows * numCols, dtype=np.int32)
+    labels[cellIndices] = runLabels[cellRuns]
+    return labels.reshape(numRows, numCols), int(isRoot.sum())
+
+
+
+''' An index of every whitespace region of a generated board, with the numbers surrounding it, built once when the mines are placed.
+    The regions never change during a game, so opening whitespace becomes a lookup instead of a search:
+    cells(row, col) returns the flat indices (row * numCols + col) of the region's whitespace and numbers in one array'''
+class ZeroRegionIndex():
+    def __init__(self, numbers):
+        numRows, numCols = numbers.shape
+        self.numCols = numCols
+        self.labels, self.numRegions = labelWhitespace(numbers)
+        area = numRows * numCols
+
+        # pair every tile with the label of each whitespace region it is part of or next to, as one sortable key: label * area + tile
+        padded = np.zeros((numRows + 2, numCols + 2), dtype=np.int64)
+        padded[1:-1, 1:-1] = self.labels
+        tiles = np.arange(area, dtype=np.int64).reshape(numRows, numCols)
+        keys = []
+        for i in range(3):
+            for j in range(3):
+                nearbyLabels = padded[i:i + numRows, j:j + numCols]
+                touching = nearbyLabels > 0
+                keys.append(nearbyLabels[touching] * area + tiles[touching])
+        keys = np.sort(np.concatenate(keys))
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+        # regionCells[regionStarts[label - 1]:regionStarts[label]] are the tiles of region `label`, in flat index order
+        self.regionCells = keys % area
+        self.regionStarts = np.searchsorted(keys // area, np.arange(1, self.numRegions + 2))
+
+
+
+    def cells(self, row, col):
+        label = self.labels[row, col]
+        if label == 0:
+            return None
+        return self.regionCells[self.regionStarts[label - 1]:self.regionStarts[label]]
+
+
+
+    def whitespaceCells(self, row, col): # just the whitespace part of cells()
+        regionCells = self.cells(row, col)
+        return regionCells[self.labels.ravel()[regionCells] == self.labels[row, col]]
@@ -0,0 +1,339 @@
+import numpy as np
+from collections import deque
+from .board import OPENED, FLAGGED, FLAG_COUNT_SHIFT, FLAG_COUNT_UNIT, VISITED
+from .engine import Engine, WHITESPACE, MINE, NOT_STARTED, PLAYING, WON
+from .generation import placeMines, seedRng, countNeighbours
+from .cascade import floodFill
+
+# chunks are CHUNK_SIZE x CHUNK_SIZE tiles (smaller along the bottom and right edges of the board): 8 KB each once they are used
+CHUNK_SIZE = 64
+
+
+
+''' A Board for endurance games, with millions of tiles: the board is cut into chunks, and a chunk only gets its numbers and state
+    arrays (a Board of its own, really) the first time something touches it. Nothing is stored for the chunks no one has touched,
+    so a board costs memory for what has been played, and starting a game costs the same on any size of board.
+
+    The mines of a chunk only depend on the seed, the dimensions, the chunk and the first click, so they are generated on first access,
+    always the same way. Every chunk gets its share of numMines in proportion to its area (not counting the first clicked tile and its
+    surrounding tiles), so the board holds exactly numMines mines. A chunk's numbers also need the mines along the edges of the
+    8 chunks around it: those are generated too, but only kept as mine masks (1 byte per tile), not as chunks.
+
+    .numbers and .state can be indexed like the arrays of a Board, with [row, col] or with [rows, cols] slices (see ChunkedPlane),
+    so the Viewport and TileAtlas draw one without knowing. Only the Engine's whole-board operations need a ChunkedEngine instead'''
+class ChunkedBoard():
+    def __init__(self, numRows, numCols, numMines, seed, chunkSize=CHUNK_SIZE):
+        self.numRows = numRows
+        self.numCols = numCols
+        self.numMines = numMines
+        self.seed = seed
+        self.chunkSize = chunkSize
+        self.numChunkRows, self.numChunkCols = -(-numRows // chunkSize), -(-numCols // chunkSize)
+        self.firstClickTile = None  # no mines exist until start() is given the first click
+        self.chunks = {}        # (chunkRow, chunkCol) -> (numbers, state) of every chunk touched so far
+        self.mineMasks = {}     # (chunkRow, chunkCol) -> boolean mine mask of every chunk whose mines were generated
+        self.numbers = ChunkedPlane(self, 0)
+        self.state = ChunkedPlane(self, 1)
+
+
+
+    def start(self, row, col): # place the mines around the first click: only chunks that were already touched (by flags) get their numbers now
+        if self.numMines > self.numRows * self.numCols - len(self.excemptTiles(row, col)):
+            raise ValueError('%d mines do not fit on a %dx%d board with a safe first click' % (self.numMines, self.numRows, self.numCols))
+        self.firstClickTile = (row, col)
+        for key, (numbers, state) in self.chunks.items():
+            self.fillNumbers(key, numbers)
+
+
+
+    def excemptTiles(self, row, col): # the first clicked tile and its surrounding tiles
+        return [(i, j) for i in range(max(row - 1, 0), min(row + 2, self.numRows)) for j in range(max(col - 1, 0), min(col + 2, self.numCols))]
+
+
+
+    def chunkBounds(self, key): # (top, left, numRows, numCols) of a chunk
+        top, left = key[0] * self.chunkSize, key[1] * self.chunkSize
+        return top, left, min(self.chunkSize, self.numRows - top), min(self.chunkSize, self.numCols - left)
+
+
+
+    def allowedBefore(self, index):
+        ''' The amount of tiles that may hold a mine in the chunks before chunk number index (counted row by row of chunks).
+            Chunk k gets the mines between allowedBefore(k) and allowedBefore(k + 1) of the board's allowed tiles, rounded down,
+            so every chunk's share only takes a few multiplications to work out and the shares always add up to numMines'''
+        chunkRow, chunkCol = divmod(index, self.numChunkCols)
+        top = chunkRow * self.chunkSize
+        area = min(top, self.numRows) * self.numCols + min(self.chunkSize, self.numRows - top) * min(chunkCol * self.chunkSize, self.numCols)
+        excempt = sum(1 for i, j in self.excemptTiles(*self.firstClickTile) if (i // self.chunkSize, j // self.chunkSize) < (chunkRow, chunkCol))
+        return area - excempt
+
+
+
+    def chunkMines(self, key): # how many mines a chunk holds
+        index = key[0] * self.numChunkCols + key[1]
+        numAllowed = self.allowedBefore(self.numChunkRows * self.numChunkCols)
+        return self.allowedBefore(index + 1) * self.numMines // numAllowed - self.allowedBefore(index) * self.numMines // numAllowed
+
+
+
+    def mineMask(self, key): # the mines of a chunk, generated the first time they are asked for
+        mask = self.mineMasks.get(key)
+        if mask is None:
+            top, left, numRows, numCols = self.chunkBounds(key)
+            row, col = self.firstClickTile
+            mines = placeMines(numRows, numCols, self.chunkMines(key), row - top, col - left,
+                               seedRng(self.seed, self.numRows, self.numCols, self.numMines, row, col, *key))
+            mask = np.zeros((numRows, numCols), dtype=bool)
+            mask.flat[mines] = True
+            self.mineMasks[key] = mask
+        return mask
+
+
+
+    def fillNumbers(self, key, numbers): # work out a chunk's numbers, counting the mines just across its edges in the chunks around it
+        top, left, numRows, numCols = self.chunkBounds(key)
+        padded = np.zeros((numRows + 2, numCols + 2), dtype=bool)
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                chunkRow, chunkCol = key[0] + i, key[1] + j
+                if not (0 <= chunkRow < self.numChunkRows and 0 <= chunkCol < self.numChunkCols):
+                    continue
+                mask = self.mineMask((chunkRow, chunkCol))
+                # the part of that chunk that falls inside the padded box: all of it for this chunk, one row and/or column otherwise
+                rows = slice(0, numRows) if i == 0 else slice(-1, None) if i < 0 else slice(0, 1)
+                cols = slice(0, numCols) if j == 0 else slice(-1, None) if j < 0 else slice(0, 1)
+                part = mask[rows, cols]
+                boxTop = 1 if i == 0 else 0 if i < 0 else numRows + 1
+                boxLeft = 1 if j == 0 else 0 if j < 0 else numCols + 1
+                padded[boxTop:boxTop + part.shape[0], boxLeft:boxLeft + part.shape[1]] = part
+
+        counts = countNeighbours(padded)[1:-1, 1:-1]
+        numbers[...] = counts
+        numbers[counts == 0] = WHITESPACE
+        numbers[padded[1:-1, 1:-1]] = MINE
+
+
+
+    def chunk(self, key): # the (numbers, state) of a chunk, made the first time it is touched
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            top, left, numRows, numCols = self.chunkBounds(key)
+            chunk = self.chunks[key] = (np.zeros((numRows, numCols), dtype=np.int8), np.zeros((numRows, numCols), dtype=np.uint8))
+            if self.firstClickTile is not None:
+                self.fillNumbers(key, chunk[0])
+        return chunk
+
+
+
+    def locate(self, row, col): # (numbers, state, row, col) of the chunk holding a tile, and where the tile is in it
+        chunkSize = self.chunkSize
+        numbers, state = self.chunk((row // chunkSize, col // chunkSize))
+        return numbers, state, row % chunkSize, col % chunkSize
+
+
+
+    def isOpened(self, row, col):
+        chunk = self.chunks.get((row // self.chunkSize, col // self.chunkSize))
+        return chunk is not None and bool(chunk[1][row % self.chunkSize, col % self.chunkSize] & OPENED)
+
+
+
+    def isFlagged(self, row, col):
+        chunk = self.chunks.get((row // self.chunkSize, col // self.chunkSize))
+        return chunk is not None and bool(chunk[1][row % self.chunkSize, col % self.chunkSize] & FLAGGED)
+
+
+
+    def amtSurroundingFlags(self, row, col):
+        return int(self.state[row, col] >> FLAG_COUNT_SHIFT)
+
+
+
+    def toggleFlag(self, row, col): # Board.toggleFlag(), one tile at a time since the 3x3 block can lie across up to 4 chunks
+        numbers, state, i, j = self.locate(row, col)
+        flagPlaced = not state[i, j] & FLAGGED
+        change = FLAG_COUNT_UNIT if flagPlaced else -FLAG_COUNT_UNIT
+        for blockRow in range(max(row - 1, 0), min(row + 2, self.numRows)):
+            for blockCol in range(max(col - 1, 0), min(col + 2, self.numCols)):
+                if (blockRow, blockCol) != (row, col):
+                    blockNumbers, blockState, k, l = self.locate(blockRow, blockCol)
+                    blockState[k, l] = (int(blockState[k, l]) + change) & ~VISITED & 0xFF
+        state[i, j] ^= FLAGGED
+        return flagPlaced
+
+
+
+    def memoryUsed(self): # bytes held by the chunks and mine masks, which only grows with what has been played
+        return sum(numbers.nbytes + state.nbytes for numbers, state in self.chunks.values()) + sum(mask.nbytes for mask in self.mineMasks.values())
+
+
+
+''' ChunkedBoard.numbers (plane 0) or .state (plane 1), indexed like a numRows x numCols array.
+    [row, col] reads one tile: reading a number makes its chunk (the Engine only reads numbers of tiles it is about to open),
+    reading a state doesn't, since an untouched tile's state is 0. [row, col] = value writes one tile, making its chunk.
+    [rows, cols] with slices copies a block of the board into a new array, without making any chunk: tiles of untouched chunks
+    have a state of 0 and a number of 0, or MINE if their chunk's mines were generated (so the mines show once the game is over)'''
+class ChunkedPlane():
+    def __init__(self, board, plane):
+        self.board = board
+        self.plane = plane
+        self.dtype = np.int8 if plane == 0 else np.uint8
+        self.shape = (board.numRows, board.numCols)
+
+
+
+    def __getitem__(self, key):
+        row, col = key
+        board = self.board
+        if isinstance(row, slice):
+            return self.block(*row.indices(board.numRows)[:2], *col.indices(board.numCols)[:2])
+        if self.plane == 0:
+            return board.locate(row, col)[0][row % board.chunkSize, col % board.chunkSize]
+        chunk = board.chunks.get((row // board.chunkSize, col // board.chunkSize))
+        return chunk[1][row % board.chunkSize, col % board.chunkSize] if chunk is not None else np.uint8(0)
+
+
+
+    def __setitem__(self, key, value):
+        numbers, state, i, j = self.board.locate(*key)
+        (numbers, state)[self.plane][i, j] = value
+
+
+
+    def block(self, top, bottom, left, right): # a copy of the tiles in rows top to bottom - 1 and columns left to right - 1
+        board, chunkSize = self.board, self.board.chunkSize
+        block = np.zeros((max(bottom - top, 0), max(right - left, 0)), dtype=self.dtype)
+        for chunkRow in range(top // chunkSize, -(-bottom // chunkSize)):
+            for chunkCol in range(left // chunkSize, -(-right // chunkSize)):
+                key = (chunkRow, chunkCol)
+                chunk = board.chunks.get(key)
+                if chunk is not None:
+                    source = chunk[self.plane]
+                elif self.plane == 0 and key in board.mineMasks:
+                    source = np.where(board.mineMasks[key], MINE, 0).astype(np.int8)
+                else:
+                    continue
+                # the part of the block this chunk covers, in board coordinates
+                rowStart, rowEnd = max(top, chunkRow * chunkSize), min(bottom, (chunkRow + 1) * chunkSize)
+                colStart, colEnd = max(left, chunkCol * chunkSize), min(right, (chunkCol + 1) * chunkSize)
+                block[rowStart - top:rowEnd - top, colStart - left:colEnd - left] = \
+                    source[rowStart - chunkRow * chunkSize:rowEnd - chunkRow * chunkSize, colStart - chunkCol * chunkSize:colEnd - chunkCol * chunkSize]
+        return block
+
+
+
+''' An Engine playing a ChunkedBoard: the same rules and the same reveal(), chord() and flag(), for boards too big to generate up front.
+    The first click generates no mines at all, only the chunks the first cascade runs into get them. Whitespace is opened one chunk at a time
+    with cascade.floodFill(), and whitespace on a chunk's edge carries the cascade on into the chunks next to it.
+    There is no mineGenerator, mineLocations or regionIndex: the mines are never all known'''
+class ChunkedEngine(Engine):
+    def __init__(self, numRows, numCols, numMines, chunkSize=CHUNK_SIZE):
+        self.chunkSize = chunkSize
+        super().__init__(numRows, numCols, numMines)
+
+
+
+    def reset(self, numRows=None, numCols=None, numMines=None, seed=None):
+        self.numRows = numRows if numRows is not None else self.numRows
+        self.numCols = numCols if numCols is not None else self.numCols
+        self.numMines = numMines if numMines is not None else self.numMines
+        self.seed = seed if seed is not None else int(self.rng.integers(1 << 63))
+        self.firstClickTile = None
+        # a new board costs nothing until it is played, so there is nothing to reuse
+        self.board = ChunkedBoard(self.numRows, self.numCols, self.numMines, self.seed, self.chunkSize)
+
+        self.state = NOT_STARTED
+        self.mineLocations = None
+        self.regionIndex = None
+        self.satisfiedTiles = set()
+        self.explodedTile = None
+        self.numMinesRemaining = self.numMines
+        self.numTilesRemaining = (self.numRows * self.numCols) - self.numMines
+
+
+
+    def firstClick(self, row, col):
+        self.firstClickTile = (row, col)
+        self.board.start(row, col)
+        self.state = PLAYING
+        return self.reveal(row, col)
+
+
+
+    def start(self, mineLocations, row, col):
+        raise NotImplementedError('the mines of a ChunkedBoard are generated a chunk at a time, they cannot be given')
+
+
+
+    def openWhitespace(self, row, col):
+        board = self.board
+        changedTiles = []
+        seeds = deque([(row, col)])
+        while seeds:
+            row, col = seeds.popleft()
+            key = (row // self.chunkSize, col // self.chunkSize)
+            numbers, state = board.chunk(key)
+            top, left, numRows, numCols = board.chunkBounds(key)
+            if state[row - top, col - left] & (OPENED | FLAGGED):
+                continue
+
+            rows, cols = np.array(floodFill(numbers, state, row - top, col - left)).T
+            changedTiles += self.openChunkCells(key, rows, cols)
+
+            # the tiles across the edge from whitespace on the chunk's edge are where the cascade goes on
+            edge = (numbers[rows, cols] == WHITESPACE) & ((rows == 0) | (rows == numRows - 1) | (cols == 0) | (cols == numCols - 1))
+            for i, j in zip((rows[edge] + top).tolist(), (cols[edge] + left).tolist()):
+                for k, l in self.neighbours(i, j):
+                    if not (top <= k < top + numRows and left <= l < left + numCols) and not board.state[k, l] & (OPENED | FLAGGED):
+                        seeds.append((k, l))
+
+        return changedTiles
+
+
+
+    def openTiles(self, tileCoordinates): # the tiles are opened a chunk at a time
+        byChunk = {}
+        for row, col in tileCoordinates:
+            byChunk.setdefault((row // self.chunkSize, col // self.chunkSize), []).append((row % self.chunkSize, col % self.chunkSize))
+        openedTiles = []
+        for key, tiles in byChunk.items():
+            openedTiles += self.openChunkCells(key, *np.array(tiles).T)
+        return openedTiles
+
+
+
+    def openChunkCells(self, key, rows, cols): # Engine.openCells() on one chunk, with rows and cols inside the chunk. Returns board coordinates
+        numbers, state = self.board.chunk(key)
+        closed = state[rows, cols] & OPENED == 0
+        rows, cols = rows[closed], cols[closed]
+        state[rows, cols] |= OPENED
+        self.numTilesRemaining -= len(rows)
+
+        top, left = key[0] * self.chunkSize, key[1] * self.chunkSize
+        openedRows, openedCols = (rows + top).tolist(), (cols + left).tolist()
+        tileNumbers = numbers[rows, cols]
+        satisfied = (tileNumbers >= 1) & (tileNumbers <= 8) & (state[rows, cols] >> FLAG_COUNT_SHIFT == tileNumbers)
+        if satisfied.any():
+            self.satisfiedTiles.update(zip((rows[satisfied] + top).tolist(), (cols[satisfied] + left).tolist()))
+
+        if self.numTilesRemaining == 0 and self.state == PLAYING:
+            self.state = WON
+            self.numMinesRemaining = 0
+        return list(zip(openedRows, openedCols))
+
+
+
+    def snapshot(self): # the state of every touched chunk, instead of a whole board's
+        boardState = {key: state.copy() for key, (numbers, state) in self.board.chunks.items()}
+        return boardState, self.state, self.numMinesRemaining, self.numTilesRemaining, self.explodedTile
+
+
+
+    def restore(self, snapshot):
+        boardState, self.state, self.numMinesRemaining, self.numTilesRemaining, self.explodedTile = snapshot
+        self.satisfiedTiles = set()
+        for key, (numbers, state) in self.board.chunks.items():
+            state[...] = boardState.get(key, 0)
+            satisfied = (state & OPENED != 0) & (numbers >= 1) & (numbers <= 8) & (state >> FLAG_COUNT_SHIFT == numbers)
+            rows, cols = np.nonzero(satisfied)
+            self.satisfiedTiles.update(zip((rows + key[0] * self.chunkSize).tolist(), (cols + key[1] * self.chunkSize).tolist()))
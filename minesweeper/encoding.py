@@ -0,0 +1,108 @@
+import base64
+import numpy as np
+from .generation import seededMines
+from .noguess import NoGuessGenerator
+
+# bumped whenever the mines a code stands for change: version 1 codes were made before NoGuessGenerator played boards with the ArraySolver,
+# so only their STANDARD boards can still be rebuilt
+VERSION = 2
+MASK_VERSION = 1
+
+# how the mines of a game were generated from its seed
+STANDARD, NO_GUESS = 0, 1
+
+
+
+''' Compact ways to store a board, so it can be shared or archived and rebuilt bit-for-bit later.
+    A game code is a short url-safe string holding everything the mines of a game depend on: the seed, the dimensions,
+    numMines, the first click and how the mines were generated (a BoardPool generates the same mines as seededMines(),
+    and a NoGuessGenerator's maxRepairs and maxAttempts are stored with it). Codes are around 20 characters long.
+    A mine mask stores the mines themselves, one bit per tile, for boards that weren't made from a seed'''
+
+def packVarints(values): # unsigned integers as 7 bits per byte, with the high bit set on every byte but the last of each value
+    data = bytearray()
+    for value in values:
+        if value < 0:
+            raise ValueError('cannot encode negative value %d' % value)
+        while value >= 0x80:
+            data.append(value & 0x7F | 0x80)
+            value >>= 7
+        data.append(value)
+    return bytes(data)
+
+
+
+def unpackVarints(data):
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append(value)
+            value, shift = 0, 0
+    if shift:
+        raise ValueError('truncated data')
+    return values
+
+
+
+def encodeGame(numRows, numCols, numMines, row, col, seed, generator=STANDARD, settings=()):
+    ''' settings are what the generator was made with, which change its boards: a NoGuessGenerator's (maxRepairs, maxAttempts).
+        STANDARD has none'''
+    if len(settings) != (2 if generator == NO_GUESS else 0):
+        raise ValueError('wrong settings %r for generator %d' % (settings, generator))
+    data = packVarints([VERSION, generator, numRows, numCols, numMines, row, col, seed, *settings])
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+
+def decodeGame(code): # returns (numRows, numCols, numMines, row, col, seed, generator, settings)
+    try:
+        values = unpackVarints(base64.urlsafe_b64decode(code + '=' * (-len(code) % 4)))
+    except ValueError as error:  # binascii.Error is a ValueError too
+        raise ValueError('%r is not a game code: %s' % (code, error))
+    if len(values) < 2 or values[0] not in (1, VERSION) or values[1] not in (STANDARD, NO_GUESS):
+        raise ValueError('%r is not a game code' % code)
+    if values[0] != VERSION and values[1] != STANDARD:
+        raise ValueError('%r was made by a version %d no-guess generator, which can no longer be rebuilt' % (code, values[0]))
+    if len(values) != (10 if values[1] == NO_GUESS else 8):
+        raise ValueError('%r is not a game code' % code)
+    return tuple(values[2:8]) + (values[1], tuple(values[8:]))
+
+
+
+def gameCode(engine): # the code of the game an Engine is playing, once the first click has been made
+    if engine.firstClickTile is None:
+        raise ValueError('the mines are only chosen on the first click, so a game has no code before that')
+    if isinstance(engine.mineGenerator, NoGuessGenerator):
+        generator, settings = NO_GUESS, (engine.mineGenerator.maxRepairs, engine.mineGenerator.maxAttempts)
+    else:
+        generator, settings = STANDARD, ()
+    return encodeGame(engine.numRows, engine.numCols, engine.numMines, *engine.firstClickTile, engine.seed, generator, settings)
+
+
+
+def gameMines(code): # rebuild a game from its code: returns (numRows, numCols, numMines, row, col, mines), ready for Engine.start(mines, row, col)
+    numRows, numCols, numMines, row, col, seed, generator, settings = decodeGame(code)
+    mineGenerator = NoGuessGenerator(*settings) if generator == NO_GUESS else seededMines
+    return numRows, numCols, numMines, row, col, mineGenerator(numRows, numCols, numMines, row, col, seed)
+
+
+
+def encodeMineMask(numRows, numCols, mines): # the dimensions, then one bit per tile in flat index order
+    mask = np.zeros(numRows * numCols, dtype=bool)
+    mask[mines] = True
+    return packVarints([MASK_VERSION, numRows, numCols]) + np.packbits(mask).tobytes()
+
+
+
+def decodeMineMask(data): # returns (numRows, numCols, mines), with the mines as sorted flat indices
+    # the header is 3 varints, which can be more than one byte each: find where it ends by counting the bytes without the high bit set
+    ends = [i for i, byte in enumerate(data[:30]) if not byte & 0x80][:3]
+    if len(ends) < 3:
+        raise ValueError('truncated mine mask')
+    version, numRows, numCols = unpackVarints(data[:ends[2] + 1])
+    if version != MASK_VERSION or len(data) - ends[2] - 1 != (numRows * numCols + 7) // 8:
+        raise ValueError('not a mine mask')
+    mask = np.unpackbits(np.frombuffer(data, dtype=np.uint8, offset=ends[2] + 1), count=numRows * numCols)
+    return numRows, numCols, np.flatnonzero(mask)
@@ -0,0 +1,264 @@
+import numpy as np
+from collections import deque
+from .board import Board, OPENED, FLAGGED, VISITED, FLAG_COUNT_SHIFT
+from .generation import seededMines, fillNumbers
+from .cascade import floodFill, ZeroRegionIndex
+
+# Board.numbers values: -1 means whitespace (no surrounding mines), 1-8 means that amount of mines are nearby, 9 means mine
+WHITESPACE = -1
+MINE = 9
+
+# Engine.state values
+NOT_STARTED, PLAYING, LOST, WON = 0, 1, 2, 3
+
+
+
+''' The rules of the game, with no pygame involved. One Engine object holds one Board and is reused from game to game with reset().
+    reveal(), chord() and flag() are the only things a client needs to call: each one returns the list of (row, col) tiles
+    whose opened/flagged state changed, so the pygame UI only has to redraw those and a headless client can ignore them completely.
+    When a mine is opened, .state becomes LOST and .explodedTile holds its location. When the last safe tile is opened, .state becomes WON'''
+class Engine():
+    def __init__(self, numRows, numCols, numMines):
+        # these values are set by the user in the Custom menu
+        self.powerDoubleclickEnabled = False
+        self.autoTileOpeningEnabled = False
+        # bots and replay tools that open a lot of whitespace can have every whitespace region worked out once, when the mines are placed
+        self.regionIndexEnabled = False
+        self.rng = np.random.default_rng()  # only draws the seeds of games that aren't given one
+        # chooses the mines on the first click: any function with the same arguments as seededMines(), such as a noguess.NoGuessGenerator
+        self.mineGenerator = seededMines
+
+        self.reset(numRows, numCols, numMines)
+
+
+
+    def reset(self, numRows=None, numCols=None, numMines=None, seed=None): # start a new game, optionally with different dimensions and numMines
+        self.numRows = numRows if numRows is not None else self.numRows
+        self.numCols = numCols if numCols is not None else self.numCols
+        self.numMines = numMines if numMines is not None else self.numMines
+        # every game has a seed: its mines only depend on the seed, the dimensions and the first click, so any game can be played again
+        self.seed = seed if seed is not None else int(self.rng.integers(1 << 63))
+        self.firstClickTile = None
+
+        # the arrays are only reallocated if the dimensions changed, otherwise the whole board is cleared in one step
+        if getattr(self, 'board', None) is not None and (self.board.numRows, self.board.numCols) == (self.numRows, self.numCols):
+            self.board.reset()
+        else:
+            self.board = Board(self.numRows, self.numCols)
+
+        self.state = NOT_STARTED
+        self.mineLocations = None
+        self.regionIndex = None
+        # every opened number with exactly that many flags around it, kept up to date by openCells() and flag()
+        self.satisfiedTiles = set()
+        self.explodedTile = None
+        self.numMinesRemaining = self.numMines
+        self.numTilesRemaining = (self.numRows * self.numCols) - self.numMines
+
+
+
+    def neighbours(self, row, col): # the (up to 8) tiles surrounding (row, col) that are actually on the board
+        for i in range(max(row - 1, 0), min(row + 2, self.numRows)):
+            for j in range(max(col - 1, 0), min(col + 2, self.numCols)):
+                if (i, j) != (row, col):
+                    yield i, j
+
+
+
+    def onBoard(self, row, col):
+        return 0 <= row < self.numRows and 0 <= col < self.numCols
+
+
+
+    def isSatisfied(self, row, col): # an opened number with exactly that many flags around it can be double-clicked
+        return (row, col) in self.satisfiedTiles
+
+
+
+    def firstClick(self, row, col): # this chooses mine locations based on the first click location, then opens the first click
+        # there must not be any mines in the first clicked tile or its surrounding tiles. mineLocations are flat indices: row * numCols + col
+        self.firstClickTile = (row, col)
+        return self.start(self.mineGenerator(self.numRows, self.numCols, self.numMines, row, col, self.seed), row, col)
+
+
+
+    def start(self, mineLocations, row, col): # start a game that hasn't started yet with the given mines, and open (row, col) as the first click
+        self.mineLocations = mineLocations
+        fillNumbers(self.board.numbers, self.mineLocations)
+        if self.regionIndexEnabled:
+            self.regionIndex = ZeroRegionIndex(self.board.numbers)
+
+        self.state = PLAYING
+        return self.reveal(row, col)
+
+
+
+    def reveal(self, row, col): # single left-click
+        if not self.onBoard(row, col) or self.state in (LOST, WON) or self.board.isOpened(row, col) or self.board.isFlagged(row, col):
+            return []
+        if self.state == NOT_STARTED:
+            return self.firstClick(row, col)
+
+        if self.board.numbers[row, col] == WHITESPACE:
+            return self.openWhitespace(row, col)
+        elif self.board.numbers[row, col] == MINE:
+            self.explode(row, col)
+            return []
+        return self.openTiles([(row, col)])
+
+
+
+    def chord(self, row, col): # double left-click on a numbered tile
+        if not self.onBoard(row, col) or self.state != PLAYING or self.board.isFlagged(row, col) or not 1 <= self.board.numbers[row, col] <= 8:
+            return []
+
+        if self.powerDoubleclickEnabled:
+            # power double-clicking isn't only activated by the double-clicked tile, but also by any of the 8 surrounding satisfied tiles
+            satisfiedTiles = [(i, j) for i, j in self.neighbours(row, col) if (i, j) in self.satisfiedTiles]
+            if (row, col) in self.satisfiedTiles:
+                satisfiedTiles.insert(0, (row, col))
+            return self.powerChord(satisfiedTiles)
+
+        return self.chordOnce(row, col)
+
+
+
+    def flag(self, row, col): # right-click: place a flag, or remove it if there already is one
+        if not self.onBoard(row, col) or self.state in (LOST, WON) or self.board.isOpened(row, col):
+            return []
+
+        flagPlaced = self.board.toggleFlag(row, col)
+        self.numMinesRemaining += -1 if flagPlaced else 1
+
+        # the flag count of every surrounding tile has changed, so each opened number around the flag either just became satisfied or isn't anymore
+        numbers, state = self.board.numbers, self.board.state
+        satisfiedTiles = []
+        for i, j in self.neighbours(row, col):
+            if state[i, j] & OPENED and 1 <= numbers[i, j] <= 8:
+                if state[i, j] >> FLAG_COUNT_SHIFT == numbers[i, j]:
+                    self.satisfiedTiles.add((i, j))
+                    satisfiedTiles.append((i, j))
+                else:
+                    self.satisfiedTiles.discard((i, j))
+
+        changedTiles = [(row, col)]
+
+        # if the user has Automatic tile opening enabled, every surrounding tile that became satisfied gets double-clicked (or power double-clicked)
+        if self.autoTileOpeningEnabled and self.state == PLAYING:
+            if self.powerDoubleclickEnabled:
+                changedTiles += self.powerChord(satisfiedTiles)
+            else:
+                for i, j in satisfiedTiles:
+                    if self.state != PLAYING:
+                        break
+                    changedTiles += self.chordOnce(i, j)
+
+        return changedTiles
+
+
+
+    def chordOnce(self, row, col): # open all unflagged tiles surrounding a satisfied numbered tile
+        if (row, col) not in self.satisfiedTiles:
+            return []
+
+        changedTiles = []
+        numberCoordinates = []
+        for i, j in self.neighbours(row, col):
+            if self.board.state[i, j] & (OPENED | FLAGGED):
+                continue
+            if self.board.numbers[i, j] == MINE:  # a flag was misplaced
+                self.explode(i, j)
+                return changedTiles + self.openTiles(numberCoordinates)
+            elif self.board.numbers[i, j] == WHITESPACE:
+                changedTiles += self.openWhitespace(i, j)
+            else:
+                numberCoordinates.append((i, j))
+
+        return changedTiles + self.openTiles(numberCoordinates)
+
+
+
+    def powerChord(self, satisfiedTiles):
+        ''' algorithm: take a satisfied numbered tile, treat it as a generic double-click, ...
+            and add any other satisfied numbered tiles surrounding it to the queue. Repeat.
+            A tile that has been double-clicked is marked VISITED, and stays that way until a flag next to it changes (see Board.toggleFlag),
+            since double-clicking it again before then can't open anything new'''
+        state = self.board.state
+        doubleClickQueue = deque()
+        for row, col in satisfiedTiles:
+            if not state[row, col] & VISITED:
+                state[row, col] |= VISITED
+                doubleClickQueue.append((row, col))
+        changedTiles = []
+
+        while doubleClickQueue and self.state == PLAYING:
+            row, col = doubleClickQueue.popleft()
+            changedTiles += self.chordOnce(row, col)
+
+            for i, j in self.neighbours(row, col):
+                if (i, j) in self.satisfiedTiles and not state[i, j] & VISITED:
+                    state[i, j] |= VISITED
+                    doubleClickQueue.append((i, j))
+
+        return changedTiles
+
+
+
+    def openWhitespace(self, row, col): # open a whitespace tile, all whitespace connected to it, and the numbers surrounding that whitespace
+        if self.regionIndex is not None:
+            # the precomputed region is only what a search would find if none of its whitespace has been opened or flagged yet
+            flatState = self.board.state.ravel()
+            if not (flatState[self.regionIndex.whitespaceCells(row, col)] & (OPENED | FLAGGED)).any():
+                regionCells = self.regionIndex.cells(row, col)
+                regionCells = regionCells[flatState[regionCells] & FLAGGED == 0]
+                return self.openCells(*np.divmod(regionCells, self.numCols))
+
+        return self.openTiles(floodFill(self.board.numbers, self.board.state, row, col))
+
+
+
+    def openTiles(self, tileCoordinates): # mark tiles as opened, and return the ones that weren't opened already
+        if not tileCoordinates:
+            return []
+        return self.openCells(*np.array(tileCoordinates).T)
+
+
+
+    def openCells(self, rows, cols): # openTiles(), for tiles given as an array of rows and an array of columns
+        state = self.board.state
+        closed = state[rows, cols] & OPENED == 0
+        rows, cols = rows[closed], cols[closed]
+        state[rows, cols] |= OPENED
+        self.numTilesRemaining -= len(rows)
+        openedTiles = list(zip(rows.tolist(), cols.tolist()))
+
+        # numbers that already have enough flags around them are satisfied as soon as they're opened
+        numbers = self.board.numbers[rows, cols]
+        satisfied = (numbers >= 1) & (numbers <= 8) & (state[rows, cols] >> FLAG_COUNT_SHIFT == numbers)
+        if satisfied.any():
+            self.satisfiedTiles.update(zip(rows[satisfied].tolist(), cols[satisfied].tolist()))
+
+        if self.numTilesRemaining == 0 and self.state == PLAYING:
+            self.state = WON
+            self.numMinesRemaining = 0
+        return openedTiles
+
+
+
+    def snapshot(self): # everything that changes while a game is played, for restore()
+        return self.board.state.copy(), self.state, self.numMinesRemaining, self.numTilesRemaining, self.explodedTile
+
+
+
+    def restore(self, snapshot): # go back to a snapshot() of the game being played (the mines must already be placed)
+        boardState, self.state, self.numMinesRemaining, self.numTilesRemaining, self.explodedTile = snapshot
+        state, numbers = self.board.state, self.board.numbers
+        state[...] = boardState
+        satisfied = (state & OPENED != 0) & (numbers >= 1) & (numbers <= 8) & (state >> FLAG_COUNT_SHIFT == numbers)
+        self.satisfiedTiles = set(zip(*(axis.tolist() for axis in np.nonzero(satisfied))))
+
+
+
+    def explode(self, row, col):
+        self.state = LOST
+        self.explodedTile = (row, col)
@@ -0,0 +1,610 @@
+import pygame, argparse, atexit, time
+from .engine import Engine, NOT_STARTED, PLAYING, LOST, WON
+from .chunked import ChunkedEngine
+from .renderer import Renderer
+from .atlas import TileAtlas
+from .viewport import Viewport
+from .pool import BoardPool
+from .replay import ReplayWriter, REVEAL, CHORD, FLAG
+from .stats import Stats
+from .widgets import Screen, Image, Label, Button, TextBox, Checkbox
+from sys import exit
+# boards with more tiles than this are played on a ChunkedBoard, which only stores the parts of the board that were played
+CHUNKED_TILES = 1 << 20
+# boards bigger than the window are scrolled with the arrow keys, and zoomed with the mouse wheel or + and -
+PAN_KEYS = {pygame.K_LEFT: (-3, 0), pygame.K_RIGHT: (3, 0), pygame.K_UP: (0, -3), pygame.K_DOWN: (0, 3)}
+ZOOM_KEYS = {pygame.K_PLUS: 1, pygame.K_EQUALS: 1, pygame.K_KP_PLUS: 1, pygame.K_MINUS: -1, pygame.K_KP_MINUS: -1}
+
+# the Gameboard and the Menu of the running game, made by main(). The menus set the Gameboard's options, and a lost game can go back to the menus
+Game = None
+menu = None
+
+
+
+def waitForEvents(timeout=0): # sleep until there is at least one event (or until timeout milliseconds have passed, if given), then return every queued event
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+
+''' Only one Gameboard object will be used per gaming session
+    Instantiation, board resets, & difficulty changes will all be handled by newGame().
+    The rules of the game live in engine.py: Gameboard only forwards clicks to its Engine and draws the tiles the Engine says have changed'''
+class Gameboard():
+    def __init__(self):
+        # the tiles. The images are loaded and scaled to the tile size by the first newGame(), not here, so the difficulty menu comes up first
+        self.atlas = TileAtlas()
+
+        # these values are used to keep track of what the user has done in the Custom menu
+        self.powerDoubleclickEnabled = False
+        self.autoTileOpeningEnabled = False
+        self.customDifficultyInputted = False
+
+        # the Engine is created by the first call to newGame(), and is reset (not recreated) for every game after that
+        self.engine = None
+        # mine layouts for the current difficulty are prepared in the background (mostly while the game over screen waits), so first clicks don't generate them
+        self.boardPool = BoardPool()
+        # everything drawn on the gameboard is marked in the Renderer, and only those parts of the window are updated once per frame
+        self.renderer = Renderer()
+        self.bottomBarFont = pygame.font.SysFont('Lucida Grande', 18)
+        # every move is logged here when the game is started with --record
+        self.replayWriter = None
+        # the hot paths are measured here when the game is started with --stats or --overlay (see stats.py), and shown in the bottom bar with --overlay
+        self.stats = None
+        self.overlayEnabled = False
+        self.overlayFont = pygame.font.SysFont('Lucida Grande', 12)
+        # the window is as big as the board, up to about the size of the screen. Bigger boards are scrolled and zoomed in a Viewport
+        desktopWidth, desktopHeight = pygame.display.get_desktop_sizes()[0]
+        self.maxBoardWidth, self.maxBoardHeight = desktopWidth - 20, desktopHeight - 60 - 25
+
+
+
+    def firstClick(self, row, col):  # the Engine chooses mine locations based on the first click location, then opens the first click
+        start = time.perf_counter() if self.stats is not None else 0
+        changedTiles = self.engine.reveal(row, col)
+        if self.engine.state == NOT_STARTED:  # the click was on a flag, which doesn't start the game
+            return
+        self.startTicks = pygame.time.get_ticks() - 1
+        if self.stats is not None:
+            self.recordMove(1, start, changedTiles)
+        self.drawTiles(changedTiles)
+        if self.replayWriter is not None:
+            self.replayWriter.record(self.engine, REVEAL, row, col, 0)
+
+
+
+    def mouseClick(self, row, col, button): # this function handles all clicks: different things happen depending on the type of click and selected tile
+        start = time.perf_counter() if self.stats is not None else 0
+        if button == 1:   # single left-click
+            changedTiles = self.engine.reveal(row, col)
+        elif button == 2: # double left-click (single-click takes care of whitespace and mines, all we have to look at are numbered tiles)
+            changedTiles = self.engine.chord(row, col)
+        elif button == 3: # right-click
+            changedTiles = self.engine.flag(row, col)
+
+        if self.stats is not None:
+            self.recordMove(button, start, changedTiles)
+        self.drawTiles(changedTiles)
+        if self.replayWriter is not None:
+            # flags placed before the first click happen at game time 0, since the timer only starts with the game
+            timestamp = pygame.time.get_ticks() - self.startTicks if self.engine.state != NOT_STARTED else 0
+            self.replayWriter.record(self.engine, {1: REVEAL, 2: CHORD, 3: FLAG}[button], row, col, timestamp)
+
+        if self.engine.state == LOST:
+            self.gameOver(self.engine.explodedTile[0], self.engine.explodedTile[1], 0)
+
+
+
+    def recordMove(self, button, start, changedTiles): # how long the Engine took for a move (started at time start), and how much it opened
+        action = {1: 'reveal', 2: 'chord', 3: 'flag'}[button]
+        self.stats.count(action)
+        self.stats.timing(action, start)
+        if action == 'reveal' and changedTiles:
+            self.stats.record('cascade', len(changedTiles))
+        elif action == 'chord' and changedTiles or action == 'flag' and len(changedTiles) > 1:  # a flag only opens tiles with auto tile opening on
+            self.stats.record('chain', len(changedTiles) - (action == 'flag'))
+
+
+
+    def drawTiles(self, tileCoordinates): # this function draws the tiles whose state was changed by the Engine: opened numbers, flags, and unflagged blue tiles
+        board, atlas, viewport = self.engine.board, self.atlas, self.viewport
+        start = time.perf_counter() if self.stats is not None else 0
+
+        # zoomed out, or with more changed tiles than there are in view, drawing everything in view is cheaper than going through the changes
+        if viewport.lod or len(tileCoordinates) > viewport.numVisible():
+            self.drawBoard()
+            numBlits = viewport.numVisible()
+        else:
+            numBlits = 0
+            for row, col in tileCoordinates:
+                if viewport.isVisible(row, col):
+                    tile = atlas.tile(board, row, col)
+                    self.renderer.markDirty(self.boardSurface.blit(tile, viewport.tilePosition(row, col)))
+                    numBlits += 1
+
+        if self.stats is not None:
+            self.stats.count('blits', numBlits)
+            self.stats.timing('draw', start)
+
+
+
+    def drawBoard(self, gameOver=None): # draw everything in the viewport (see Viewport.draw() for gameOver)
+        self.viewport.draw(self.boardSurface, self.atlas, self.engine.board, gameOver)
+        self.renderer.markDirty(self.boardSurface.get_rect())
+
+
+
+    def pan(self, dx, dy): # scroll the viewport by (dx, dy) tiles
+        if self.viewport.pan(dx * self.viewport.tilesize, dy * self.viewport.tilesize):
+            self.drawBoard()
+
+
+
+    def zoom(self, steps, x, y): # zoom in or out by steps levels around (x, y) of the window (see Viewport.zoom())
+        if self.viewport.zoom(steps, x, y):
+            if not self.viewport.lod:
+                self.atlas.setTilesize(self.viewport.tilesize)
+            self.drawBoard()
+
+
+
+    def gameOver(self, row, col, gameState): # game ends either by clicking a mine or winning the game
+        if self.replayWriter is not None:
+            self.replayWriter.endGame()
+        engine, board = self.engine, self.engine.board
+
+        # display all blue mines and green flags in the visible part of the board, and a red mine where it exploded if the game ended by a mine click.
+        # Only the mines are drawn again, found from the Engine's mine locations: every other tile already looks the way it should
+        self.viewport.drawGameOver(self.boardSurface, self.atlas, board, engine.mineLocations, engine.state == WON, (row, col) if gameState == 0 else None)
+        self.renderer.markDirty(self.boardSurface.get_rect())
+
+        
+        # set size and location of "Click for a new game" box
+        boxWidth = 185
+        boxHeight = 35
+        boxLeft = (self.screenWidth - boxWidth) / 2
+        boxTop = self.screenHeight * .66
+
+        # display "Click for a new game" box
+        newGameBox = pygame.Surface((boxWidth, boxHeight))  # newGameBox is a new Surface object
+        newGameBox.set_alpha(200)                           # make it a little transparent
+        newGameBox.fill((30,30,30))
+        self.screen.blit(newGameBox, (boxLeft, boxTop))     # blit newGameBox surface onto the main surface
+
+        # display "Click for a new game" text
+        font = pygame.font.SysFont('Lucida Grande', 15)
+        newGameText = font.render("Click for a new game", True, (255, 255, 255))
+        self.screen.blit(newGameText, (boxLeft + 16, boxTop + 8))
+        self.renderer.markEverything()
+        self.renderer.present()
+        if self.stats is not None:
+            self.stats.cancelFrame()
+
+        # wait for the user to either quit out of the window, click the "Click for a new game" box, or click the "Change difficulty" box
+        while True:
+            for event in waitForEvents():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    pygame.quit()
+                    exit()
+
+                if event.type == pygame.MOUSEBUTTONUP:
+                    x,y = pygame.mouse.get_pos()
+                    pygame.mouse.get_pressed()
+                    if event.button == 1:
+                        if boxLeft < x < boxLeft + boxWidth and boxTop < y < boxTop + boxHeight:    # user clicks "Create a new game" box
+                            self.newGame(self.numRows, self.numCols, self.numMines, self.TILESIZE)  # reset the gameboard with the same dimensions and numMines
+                            return
+
+                        # user clicks "Change difficulty" box
+                        elif (int(Game.screenWidth / 2) - 56) < x < (int(Game.screenWidth / 2) + 61) and (Game.screenHeight - 21) < y < (Game.screenHeight - 4):
+                            menu.difficultyMenu()
+                            Game.newGame(menu.numRows, menu.numCols, menu.numMines, menu.tilesize)
+                            return
+
+
+
+    def newGame(self, numRows, numCols, numMines, tilesize): # this function resets the Gameboard class properties, and displays the new gameboard
+        if self.replayWriter is not None:
+            self.replayWriter.endGame()  # the last game was abandoned
+        # most of Gameboard's member variables are initialized here. The game (and its timer) is started by the Engine's first click, not here
+        self.numRows = numRows
+        self.numCols = numCols
+        self.numMines = numMines
+        self.TILESIZE = tilesize
+        
+        self.screenWidth = min(numCols * self.TILESIZE, self.maxBoardWidth)
+        self.screenHeight = min(numRows * self.TILESIZE, self.maxBoardHeight) + 25 # 25 extra pixels for the bottom bar
+        self.displayedTimer = 0
+        self.startTicks = 0
+
+        # start a new game in the Engine, with the options the user picked in the Custom menu and a seed the board pool has a layout ready for.
+        # Endurance boards have no layout to prepare: their mines are generated a chunk at a time as the game is played
+        chunked = numRows * numCols > CHUNKED_TILES
+        if self.engine is None or isinstance(self.engine, ChunkedEngine) != chunked:
+            self.engine = ChunkedEngine(numRows, numCols, numMines) if chunked else Engine(numRows, numCols, numMines)
+            if not chunked:
+                self.engine.mineGenerator = self.boardPool
+        if chunked:
+            self.engine.reset(numRows, numCols, numMines)
+        else:
+            self.boardPool.setDimensions(numRows, numCols, numMines)
+            self.engine.reset(numRows, numCols, numMines, self.boardPool.nextSeed())
+        self.engine.powerDoubleclickEnabled = self.powerDoubleclickEnabled
+        self.engine.autoTileOpeningEnabled = self.autoTileOpeningEnabled
+        self.screen = pygame.display.set_mode((self.screenWidth, self.screenHeight))
+        self.screen.set_alpha(None)
+        # the board is drawn on the part of the window above the bottom bar, so tiles partly out of view can't draw over the bar
+        self.boardSurface = self.screen.subsurface((0, 0, self.screenWidth, self.screenHeight - 25))
+        self.viewport = Viewport(numRows, numCols, self.TILESIZE, self.screenWidth, self.screenHeight - 25)
+
+        # scale the images and render the numbers for this tile size (this does nothing if the tile size hasn't changed)
+        self.atlas.setTilesize(self.TILESIZE)
+
+        # create the blue checkerboard pattern
+        self.viewport.draw(self.boardSurface, self.atlas, self.engine.board)
+
+        # draw the bottom bar and the "Change difficulty box"
+        pygame.draw.rect(self.screen, (200,200,210), (0, self.screenHeight - 25, self.screenWidth, 25))
+        font = pygame.font.SysFont('Lucida Grande', 13)
+        difficultyText = font.render("Change difficulty", True, (20, 20, 20), (200, 200, 210))
+        difficultyRect = difficultyText.get_rect()
+        difficultyRect.center = (int(self.screenWidth / 2) + 3, int(self.screenHeight - 13))            
+        self.screen.blit(difficultyText, difficultyRect)
+        difficultyRect.width, difficultyRect.height, difficultyRect.left = 117, 17, difficultyRect.left - 5
+        pygame.draw.rect(self.screen, (110, 110,170), difficultyRect, 1)
+        # the timer, minesRemaining and overlay texts have to be drawn again on top of the new bottom bar
+        self.timerString, self.minesRemainingString, self.overlayString = None, None, None
+        self.renderer.markEverything()
+        if self.stats is not None:
+            self.stats.cancelFrame()  # the frame that started a new game also waited on the menus
+
+
+
+    def msUntilTimerChanges(self): # the timer shows hundredths of a second for the first 10 seconds, then tenths, then whole seconds
+        elapsed = pygame.time.get_ticks() - self.startTicks
+        step = 10 if elapsed < 10000 else 100 if elapsed < 100000 else 1000
+        return step - elapsed % step
+
+
+
+    def drawBottomBar(self, gameTime): # draw the timer and minesRemaining texts, but only if what they say has changed
+        timerString = str(gameTime) + "   "
+        if timerString != self.timerString:
+            self.timerString = timerString
+            timerText = self.bottomBarFont.render(timerString, True, (34, 34, 34), (200, 200, 210))
+            self.renderer.markDirty(self.screen.blit(timerText, (7, self.screenHeight - 23)))
+
+        minesRemainingString = "   " + str(self.engine.numMinesRemaining)
+        if minesRemainingString != self.minesRemainingString:
+            self.minesRemainingString = minesRemainingString
+            numMinesRemainingText = self.bottomBarFont.render(minesRemainingString, True, (34, 34, 34), (200, 200, 210))
+            # set minesRemaining text to correct location
+            numMinesRemainingRect = numMinesRemainingText.get_rect()
+            numMinesRemainingRect.right, numMinesRemainingRect.top = self.screenWidth - 9, self.screenHeight - 23
+            self.renderer.markDirty(self.screen.blit(numMinesRemainingText, numMinesRemainingRect))
+
+        if self.overlayEnabled:
+            self.drawOverlay()
+
+
+
+    def drawOverlay(self): # the stats overlay goes between the "Change difficulty" box and the minesRemaining text, in whatever form fits there
+        left, right = int(self.screenWidth / 2) + 66, self.screenWidth - 55
+        if right <= left:
+            return
+        for overlayString in (self.stats.overlayText(), self.stats.overlayText(short=True), ''):
+            if self.overlayFont.size(overlayString)[0] <= right - left:
+                break
+        if overlayString == self.overlayString:
+            return
+        self.overlayString = overlayString
+        overlayRect = pygame.Rect(left, self.screenHeight - 22, right - left, 18)
+        self.screen.fill((200, 200, 210), overlayRect)
+        overlayText = self.overlayFont.render(overlayString, True, (90, 90, 110), (200, 200, 210))
+        self.screen.blit(overlayText, overlayText.get_rect(midright=overlayRect.midright))
+        self.renderer.markDirty(overlayRect)
+
+
+
+
+#######    DIFFICULTY MENU    ########
+MENU_SIZE = (300, 350)
+MENU_BACKGROUND = (199, 204, 216)
+
+''' The difficulty menu, and the Help and Custom menus it leads to. Each menu is a Screen of widgets (see widgets.py) that is built once,
+    when the Menu is created, so going from one menu to another is a single blit, and the window only changes size when it has to.
+    One loop handles every menu: it sleeps until the user does something, hands clicks to whatever widget is under the mouse,
+    and only the widgets that changed (the Custom menu's text boxes, checkboxes and error message) are drawn again.
+    difficultyMenu() returns once the user clicks Beginner, Intermediate, or Expert, or types in custom game parameters'''
+class Menu():
+    def __init__(self):
+        self.numRows = 0
+        self.numCols = 0
+        self.numMines = 0
+        self.tilesize = 28
+        self.window = None
+        self.screen = None      # the menu being shown
+        self.chosen = False     # whether the user has picked a difficulty yet
+
+        # the Beginner, Intermediate, Expert, Custom, and Help boxes
+        font = pygame.font.SysFont('Lucida Grande', 20)
+        difficultyColor, otherBoxColor = (245, 245, 250), (34, 34, 34)
+        self.difficultyScreen = Screen(MENU_SIZE, MENU_BACKGROUND, [
+            Button((50, 40, 200, 42), 'Beginner', font, difficultyColor, fill=(82, 108, 235), onClick=lambda: self.choose(10, 10, 15)),
+            Button((50, 99, 200, 42), 'Intermediate', font, difficultyColor, fill=(52, 78, 165), onClick=lambda: self.choose(15, 27, 80)),
+            Button((50, 158, 200, 42), 'Expert', font, difficultyColor, fill=(22, 48, 115), onClick=lambda: self.choose(24, 30, 155)),
+            Button((100, 225, 100, 34), 'Custom', font, otherBoxColor, border=(52, 78, 165), borderWidth=2, onClick=self.customMenu),
+            Button((110, 275, 80, 30), 'Help', font, otherBoxColor, border=(52, 78, 165), borderWidth=2, onClick=self.helpMenu),
+        ])
+        # the Help menu is drawn on top of the difficulty menu, so it is only made once the difficulty menu has been drawn
+        self.helpScreen = None
+
+        smallFont = pygame.font.SysFont('Lucida Grande', 9)
+        mediumFont = pygame.font.SysFont('Lucida Grande', 12)
+        largeFont = pygame.font.SysFont('Lucida Grande', 15)
+        self.helpFont = largeFont
+        # the keyboard input boxes allow a maximum of 2, 2, 4, & 2 digits
+        self.rowsBox = TextBox((140, 45, 50, 25), largeFont, 2)
+        self.colsBox = TextBox((140, 80, 50, 25), largeFont, 2)
+        self.minesBox = TextBox((140, 115, 50, 25), largeFont, 4)
+        self.tilesizeBox = TextBox((140, 150, 30, 25), largeFont, 2)
+        self.powerDoubleclickBox = Checkbox((175, 200, 15, 15), onClick=self.togglePowerDoubleclick)
+        self.autoTileOpeningBox = Checkbox((175, 224, 15, 15), onClick=self.toggleAutoTileOpening)
+        self.errorLabel = Label('', smallFont, (229, 0, 0), rect=(157, 317, 120, 20), background=MENU_BACKGROUND, offset=(3, 1))
+        self.customScreen = Screen(MENU_SIZE, MENU_BACKGROUND, [
+            Label('Making the board too small or too large', smallFont, (229, 0, 0), (150, 9), 'center'),
+            Label('may cause issues, be wary.', smallFont, (229, 0, 0), (150, 20), 'center'),
+            Label('Rows:', largeFont, (0, 0, 0), (35, 43)),
+            Label('10 to 99', smallFont, (52, 52, 77), (35, 59)),
+            Label('Columns:', largeFont, (0, 0, 0), (35, 78)),
+            Label('10 to 99', smallFont, (52, 52, 77), (35, 94)),
+            Label('Mines:', largeFont, (0, 0, 0), (35, 113)),
+            Label('1 to rows * cols - 10', smallFont, (52, 52, 77), (35, 129)),
+            Label('Tile size:', largeFont, (0, 0, 0), (34, 147)),
+            Label('15 to 50', smallFont, (52, 52, 77), (34, 164)),
+            Label('pixels', smallFont, (0, 0, 0), (175, 160)),
+            Label('Power double-click', mediumFont, (0, 0, 0), (35, 200)),
+            Label('Automatic tile opening', mediumFont, (0, 0, 0), (35, 224)),
+            self.rowsBox, self.colsBox, self.minesBox, self.tilesizeBox, self.powerDoubleclickBox, self.autoTileOpeningBox,
+            Button((45, 285, 95, 30), 'Cancel', largeFont, fill=(200, 200, 200), border=(0, 0, 0), onClick=lambda: self.show(self.difficultyScreen)),
+            Button((160, 285, 95, 30), 'OK', largeFont, fill=(200, 200, 200), border=(0, 0, 0), onClick=self.submitCustom),
+            self.errorLabel,
+        ])
+
+
+
+    def showDifficultyMenu(self):
+        # the window only has to be made again if a game changed its size
+        self.window = pygame.display.get_surface()
+        if self.window is None or self.window.get_size() != MENU_SIZE:
+            self.window = pygame.display.set_mode(MENU_SIZE)
+        self.chosen = False
+        self.show(self.difficultyScreen)
+
+
+
+    def difficultyMenu(self):
+        self.showDifficultyMenu()
+
+        # the user may go back and forth from the Help and Custom menus, but this loop will end when they select/input a difficulty or close the window
+        while not self.chosen:
+            for event in waitForEvents():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    exit()
+
+                # keys go to the selected text box first. Otherwise Esc leaves the Help and Custom menus, and the game from the difficulty menu
+                elif event.type == pygame.KEYDOWN and not self.screen.keyPressed(event.key) and event.key == pygame.K_ESCAPE:
+                    if self.screen is self.difficultyScreen:
+                        pygame.quit()
+                        exit()
+                    self.show(self.difficultyScreen)
+
+                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                    self.screen.click(*pygame.mouse.get_pos())
+                    if self.chosen:
+                        return
+            self.screen.refresh(self.window)
+
+
+
+    def show(self, screen): # switch to another menu
+        self.screen = screen
+        screen.selected = None
+        screen.show(self.window)
+
+
+
+    def choose(self, numRows, numCols, numMines): # Beginner, Intermediate or Expert
+        self.numRows, self.numCols, self.numMines, self.tilesize = numRows, numCols, numMines, 28
+        Game.customDifficultyInputted, Game.powerDoubleclickEnabled, Game.autoTileOpeningEnabled = False, False, False
+        self.chosen = True
+
+
+
+    def helpMenu(self): # a transparent gray Help box over the difficulty menu. Clicking [X] or anywhere outside of it goes back
+        if self.helpScreen is None:
+            back = lambda: self.show(self.difficultyScreen)
+            lines = ['Left-click to open a tile', 'Right-click to place a flag', 'Double-click\'s special ability:', '- Opens all surrounding tiles',
+                     '- BUT there must be the', '   correct amount of flags', '   surrounding the tile', '- Works for both opened', '   and unopened tiles']
+            self.helpScreen = Screen(MENU_SIZE, MENU_BACKGROUND, [
+                Image((0, 0), self.difficultyScreen.surface.copy(), onClick=back),
+                Button((35, 10, 230, 330), fill=(30, 30, 30, 230)),
+                Label('[X]', self.helpFont, (255, 0, 0), (40, 13), onClick=back),
+                *(Label(line, self.helpFont, (255, 255, 255), (45, top)) for line, top in zip(lines, (45, 95, 145, 165, 185, 205, 225, 245, 265))),
+            ])
+        self.show(self.helpScreen)
+
+
+
+    def customMenu(self):
+        # the boxes show the last custom game's parameters, and the tile size of the last game
+        self.rowsBox.setText(str(Game.numRows) if Game.customDifficultyInputted else '')
+        self.colsBox.setText(str(Game.numCols) if Game.customDifficultyInputted else '')
+        self.minesBox.setText(str(Game.numMines) if Game.customDifficultyInputted else '')
+        self.tilesizeBox.setText(str(getattr(Game, 'TILESIZE', 28)))
+        self.powerDoubleclickBox.setChecked(Game.powerDoubleclickEnabled)
+        self.autoTileOpeningBox.setChecked(Game.autoTileOpeningEnabled)
+        self.errorLabel.setText('')
+        self.show(self.customScreen)
+
+
+
+    def togglePowerDoubleclick(self):
+        Game.powerDoubleclickEnabled = not Game.powerDoubleclickEnabled
+        self.powerDoubleclickBox.setChecked(Game.powerDoubleclickEnabled)
+
+
+
+    def toggleAutoTileOpening(self):
+        Game.autoTileOpeningEnabled = not Game.autoTileOpeningEnabled
+        self.autoTileOpeningBox.setChecked(Game.autoTileOpeningEnabled)
+
+
+
+    def submitCustom(self): # OK: check that all keyboard input is within the correct range. If not, display a warning message
+        numRows, numCols, numMines, tilesize = (int(box.text or '0') for box in (self.rowsBox, self.colsBox, self.minesBox, self.tilesizeBox))
+        if not (10 <= numRows <= 99 and 10 <= numCols <= 99 and 1 <= numMines <= numRows * numCols - 10):
+            self.errorLabel.setText('dimensions not accepted')
+        elif not 15 <= tilesize <= 50:
+            self.errorLabel.setText('tile size not accepted')
+        else:
+            self.numRows, self.numCols, self.numMines, self.tilesize = numRows, numCols, numMines, tilesize
+            Game.customDifficultyInputted = True
+            self.chosen = True
+
+
+
+#######    MAIN LOOP    #######
+def main(argv=None):
+    global Game, menu
+    parser = argparse.ArgumentParser(prog='minesweeper', description='Minesweeper')
+    parser.add_argument('--record', metavar='FILE', help='append every move of every game to this replay log (see replay.py)')
+    parser.add_argument('--stats', metavar='FILE', help='measure the hot paths of the game, and write what was measured to this file on exit (see stats.py)')
+    parser.add_argument('--overlay', action='store_true', help='measure the hot paths of the game, and show frame time and click latency in the bottom bar')
+    parser.add_argument('--endurance', nargs=3, type=int, metavar=('ROWS', 'COLS', 'MINES'),
+                        help='skip the menus and play one board of any size: boards over %d tiles are only generated as they are played' % CHUNKED_TILES)
+    parser.add_argument('--first-frame', action='store_true', help='quit as soon as the first frame (the difficulty menu, or the board with --endurance) is shown: bench.py times cold starts with it')
+    arguments = parser.parse_args(argv)
+
+    # only the parts of pygame the game uses are started: no audio, joysticks or cameras. The display starts the event queue as well,
+    # and waiting once starts SDL's timer, which pygame.time.get_ticks() counts from (it is always 0 until then)
+    pygame.display.init()
+    pygame.font.init()
+    pygame.time.wait(0)
+    pygame.display.set_caption("Minesweeper")
+    # nothing in the game reacts to the mouse moving or buttons being pressed down, so those events shouldn't wake anything up
+    pygame.event.set_blocked([pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN])
+
+    running = True
+    lastClickTicks = None  # when the last single left-click happened, used to detect double-clicks
+    Game = Gameboard()
+    if arguments.record:
+        Game.replayWriter = ReplayWriter(arguments.record)
+        atexit.register(Game.replayWriter.close)  # the game can be quit from any of the menus
+    if arguments.stats or arguments.overlay:
+        Game.stats = Game.renderer.stats = Stats()
+        Game.overlayEnabled = arguments.overlay
+        if arguments.stats:
+            atexit.register(Game.stats.dump, arguments.stats)
+    menu = Menu()
+    if arguments.endurance:
+        Game.newGame(*arguments.endurance, 20)
+    elif arguments.first_frame:
+        menu.showDifficultyMenu()
+    else:
+        # load up the start menu and obtain the difficulty the user wants
+        menu.difficultyMenu()
+        # create and display the gameboard
+        Game.newGame(menu.numRows, menu.numCols, menu.numMines, menu.tilesize)
+
+    if arguments.first_frame:
+        if arguments.endurance:
+            Game.drawBottomBar(0.0)
+            Game.renderer.present()
+        pygame.quit()
+        return
+
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL])
+    pygame.key.set_repeat(250, 40)  # holding an arrow key keeps scrolling
+
+    # THE OPTIONS FOR THE USER ARE: closing out of the window or pressing Esc, (single/double left-clicking)/right-clicking a tile, or clicking on "Change difficulty"
+    while running:
+        # sleep until the user does something, or until the displayed timer is about to change (only while a game is being played)
+        events = waitForEvents(Game.msUntilTimerChanges() if Game.engine.state == PLAYING else 0)
+        if Game.stats is not None:
+            Game.stats.startFrame()
+        for event in events:
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):   # user closes window or presses Esc
+                running = False
+
+            elif event.type == pygame.WINDOWEXPOSED: # the window was covered up, so only updating the changed parts of it isn't enough
+                Game.renderer.markEverything()
+
+            # boards bigger than the window are scrolled with the arrow keys, and zoomed with the mouse wheel or + and -
+            elif event.type == pygame.KEYDOWN and event.key in PAN_KEYS:
+                Game.pan(*PAN_KEYS[event.key])
+
+            elif event.type == pygame.KEYDOWN and event.key in ZOOM_KEYS:
+                Game.zoom(ZOOM_KEYS[event.key], Game.viewport.width // 2, Game.viewport.height // 2)
+
+            elif event.type == pygame.MOUSEWHEEL and event.y:
+                Game.zoom(1 if event.y > 0 else -1, *pygame.mouse.get_pos())
+
+            elif event.type == pygame.MOUSEBUTTONUP:
+                x,y = pygame.mouse.get_pos()
+                tile = Game.viewport.tileAt(x, y)  # None outside the board
+                row, col = tile if tile is not None else (-1, -1)
+                pygame.mouse.get_pressed()
+                if event.button == 1:
+                    # check if user clicked on "Change difficulty" box. We will still have access to (x, y) from the main loop
+                    if int(Game.screenWidth / 2) - 56 < x < int(Game.screenWidth / 2) + 61 and Game.screenHeight - 21 < y < Game.screenHeight - 4:
+                        menu.difficultyMenu()
+                        Game.newGame(menu.numRows, menu.numCols, menu.numMines, menu.tilesize)
+                        continue
+
+                    elif Game.engine.state == NOT_STARTED and tile is not None: # game hasn't been started and user clicks on a tile
+                        if Game.stats is not None:
+                            Game.stats.click()
+                        Game.firstClick(row, col)    # first click is important... determines the positions of the mines
+                        continue
+
+                    if Game.stats is not None:
+                        Game.stats.click()
+                    Game.mouseClick(row, col, 1)     # single left-click (ALWAYS EXECUTES, DOUBLE CLICK WILL BE SENT AFTER THE INITIAL SINGLE CLICK)
+
+                    clickTicks = pygame.time.get_ticks()
+                    if lastClickTicks is not None and clickTicks - lastClickTicks <= 250:
+                        Game.mouseClick(row, col, 2) # double left-click (second click happens within 250 milliseconds of first)
+                        lastClickTicks = None
+                    else:
+                        lastClickTicks = clickTicks
+
+                elif event.button == 3 and tile is not None: #right-click
+                    if Game.stats is not None:
+                        Game.stats.click()
+                    Game.mouseClick(row, col, 3)
+
+        if Game.engine.state == PLAYING:
+            Game.displayedTimer = pygame.time.get_ticks() - Game.startTicks
+
+        # displayed timer will have 2 decimal places before 10 seconds, 1 decimal place before 100 seconds, 0 decimals afterwards
+        if Game.displayedTimer < 10000:
+            gameTime = round(Game.displayedTimer / 1000, 2)
+        elif Game.displayedTimer < 100000:
+            gameTime = round(Game.displayedTimer / 1000, 1)
+        else:
+            gameTime = Game.displayedTimer // 1000
+
+        # display the timer and minesRemaining texts onto the bottom bar, then update only the parts of the window that were drawn on this frame
+        Game.drawBottomBar(gameTime)
+        Game.renderer.present()
+        if Game.stats is not None:
+            Game.stats.endFrame()
+
+        if Game.engine.state == WON: # if game is won, call gameOver() with a gameState of 1
+            Game.gameOver(0, 0, 1)
+
+    pygame.quit()
@@ -0,0 +1,126 @@
+import numpy as np
+
+# Board.numbers values, repeated here so this module doesn't depend on the Engine
+WHITESPACE = -1
+MINE = 9
+
+
+
+''' Board generation: choosing the mine locations and working out every tile's number.
+    Everything here works on whole arrays, so generating a board takes time proportional to its area and nothing else'''
+
+def excemptLocations(numRows, numCols, row, col): # the sorted flat indices of the first clicked tile and its surrounding tiles (those must not be mines)
+    rows = np.arange(max(row - 1, 0), min(row + 2, numRows))
+    cols = np.arange(max(col - 1, 0), min(col + 2, numCols))
+    return (rows[:, None] * numCols + cols[None, :]).ravel()
+
+
+
+def placeMines(numRows, numCols, numMines, row, col, rng):
+    ''' Returns numMines distinct flat indices (row * numCols + col), none of them next to (row, col).
+        Instead of building the population of allowed tiles, numMines values are drawn from range(amount of allowed tiles)
+        and each one is shifted past the excempt tiles that come before it'''
+    excempt = excemptLocations(numRows, numCols, row, col)
+    numAllowed = numRows * numCols - len(excempt)
+    if not 0 <= numMines <= numAllowed:
+        raise ValueError('%d mines do not fit on a %dx%d board with a safe first click' % (numMines, numRows, numCols))
+
+    mines = rng.choice(numAllowed, numMines, replace=False)
+
+    # allowedBefore[i] is how many allowed tiles come before excempt[i], so a drawn value k lands after every excempt tile with allowedBefore <= k
+    allowedBefore = excempt - np.arange(len(excempt))
+    return mines + np.searchsorted(allowedBefore, mines, side='right')
+
+
+
+def seedRng(seed, *values): # a Generator that only depends on the seed and the given values, the same on every platform and every run
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence([seed, *values])))
+
+
+
+def relocatableLayout(numRows, numCols, numMines, rng):
+    ''' numMines mines anywhere on the board, which relocateMines() makes ready for a first click.
+        Returns (mines, slots): the mines as flat indices, and slots[tile], where the tile is in mines (or -1 if it isn't a mine)'''
+    mines = rng.choice(numRows * numCols, numMines, replace=False)
+    slots = np.full(numRows * numCols, -1, dtype=np.int64)
+    slots[mines] = np.arange(numMines)
+    return mines, slots
+
+
+
+def relocateMines(mines, slots, numRows, numCols, row, col, rng):
+    ''' Moves the mines (at most 9) on and around the first clicked tile to random free tiles, and returns mines.
+        Every set of mines that avoids the clicked tile is still equally likely afterwards, exactly like placeMines(),
+        and it costs the same on any size of board, since the slots mean no mine ever has to be searched for'''
+    excempt = excemptLocations(numRows, numCols, row, col)
+    if len(mines) > numRows * numCols - len(excempt):
+        raise ValueError('%d mines do not fit on a %dx%d board with a safe first click' % (len(mines), numRows, numCols))
+
+    for tile in excempt[slots[excempt] >= 0].tolist():
+        # pick random tiles until one is free: on all but the densest boards that takes a try or two, otherwise list the free tiles
+        for attempt in range(32):
+            destination = int(rng.integers(numRows * numCols))
+            if slots[destination] < 0 and destination not in excempt:
+                break
+        else:
+            free = np.flatnonzero(slots < 0)
+            free = free[~np.isin(free, excempt)]
+            destination = int(free[rng.integers(len(free))])
+        slots[destination] = slots[tile]
+        mines[slots[tile]] = destination
+        slots[tile] = -1
+    return mines
+
+
+
+def seededMines(numRows, numCols, numMines, row, col, seed):
+    ''' The mines of the game with this seed, dimensions and first click. The layout only depends on the seed and the dimensions
+        (so it can be made before the first click, see pool.BoardPool), and moving the mines away from the first click on the click too'''
+    mines, slots = relocatableLayout(numRows, numCols, numMines, seedRng(seed, numRows, numCols, numMines))
+    return relocateMines(mines, slots, numRows, numCols, row, col, seedRng(seed, numRows, numCols, numMines, row, col))
+
+
+
+def countNeighbours(mineMask): # the amount of mines surrounding every tile, as one 3x3 box sum over a zero-padded copy of the board (or a stack of boards)
+    numRows, numCols = mineMask.shape[-2:]
+    padded = np.zeros(mineMask.shape[:-2] + (numRows + 2, numCols + 2), dtype=np.int8)
+    padded[..., 1:-1, 1:-1] = mineMask
+
+    counts = np.zeros(mineMask.shape, dtype=np.int8)
+    for i in range(3):
+        for j in range(3):
+            if (i, j) != (1, 1):
+                counts += padded[..., i:i + numRows, j:j + numCols]
+    return counts
+
+
+
+def fillNumbers(numbers, mines): # write the numbers of a board with mines at the given flat indices into the numbers array (or a stack of boards' numbers)
+    mineMask = np.zeros(numbers.shape, dtype=bool)
+    mineMask.flat[mines] = True
+
+    numbers[...] = countNeighbours(mineMask)
+    numbers[numbers == 0] = WHITESPACE
+    numbers[mineMask] = MINE
+
+
+
+def refreshNumbers(numbers, row, col): # work out the numbers of the tiles around (row, col) again, after a mine next to them was added or removed
+    numRows, numCols = numbers.shape
+    top, left = max(row - 2, 0), max(col - 2, 0)
+    counts = countNeighbours(numbers[top:row + 3, left:col + 3] == MINE)
+
+    rows, cols = slice(max(row - 1, 0), row + 2), slice(max(col - 1, 0), col + 2)
+    counts = counts[rows.start - top:rows.stop - top, cols.start - left:cols.stop - left]
+    box = numbers[rows, cols]
+    notMines = box != MINE
+    box[notMines] = np.where(counts == 0, WHITESPACE, counts)[notMines]
+
+
+
+def moveMine(numbers, source, destination): # move the mine at flat index source to flat index destination, only updating the numbers around the two
+    numCols = numbers.shape[1]
+    numbers.flat[source] = 0
+    numbers.flat[destination] = MINE
+    refreshNumbers(numbers, *divmod(source, numCols))
+    refreshNumbers(numbers, *divmod(destination, numCols))
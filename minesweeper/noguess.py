@@ -0,0 +1,155 @@
+''' Boards that can be finished from the first click without ever guessing.
+    Usage example, to measure how many boards per second can be generated:
+        python -m minesweeper.noguess --rows 16 --cols 30 --mines 99 --boards 200'''
+import argparse, time
+import numpy as np
+from .engine import Engine, MINE
+from .generation import moveMine, seedRng, seededMines
+from .solver import ArraySolver, blockSum
+
+
+
+FRAME_MS = 1000 / 60  # a board is made when the first click of a game comes in, so it should take well under a frame at 60 fps
+# boards that get finished hardly ever need more than 10 repairs: most of the ones that don't are stuck on a 50/50 between
+# the last closed tiles, which moving the mine from one to the other doesn't change
+MAX_REPAIRS = 10
+
+
+
+''' Generates mine locations like seededMines() (and takes the same arguments, so it can be an Engine's mineGenerator),
+    but only returns boards the Solver can finish from the first click. The same seed, dimensions and first click give the same board.
+
+    A scratch Engine makes a random board and opens the first click, and an ArraySolver plays it from there until it is won or stuck:
+    it finishes the same boards as the Solver, but works on the whole board at once, which is several times faster when every tile
+    of the board gets played. When it is stuck,
+    instead of throwing the board away, a mine next to the stuck frontier is moved somewhere else (see repair()), and play carries on
+    from where it was. After maxRepairs repairs without finishing, the board is rejected (maxRepairs=0 rejects a board the first time
+    it gets stuck): a layout that needs many repairs rarely gets finished, and a fresh one is cheaper than repairing it further.
+    A repaired board is played again from the first click before it is returned, since the numbers that the earlier deductions
+    were made from have changed.
+    If no board is found in maxAttempts tries, an ordinary board is returned and counted in .failures.
+    .boards, .attempts, .repairs and .seconds add up over every call, for throughput()'''
+class NoGuessGenerator():
+    def __init__(self, maxRepairs=MAX_REPAIRS, maxAttempts=200):
+        self.maxRepairs = maxRepairs
+        self.maxAttempts = maxAttempts
+        self.engine = None
+        self.solver = None
+        self.boards = self.attempts = self.repairs = self.failures = 0
+        self.seconds = 0.0
+
+
+
+    def __call__(self, numRows, numCols, numMines, row, col, seed):
+        start = time.perf_counter()
+        rng = seedRng(seed, numRows, numCols, numMines, row, col)
+        if self.engine is None:
+            self.engine = Engine(numRows, numCols, numMines)
+            self.solver = ArraySolver(self.engine)
+        engine = self.engine
+        engine.rng = rng
+
+        mines = None
+        for attempt in range(self.maxAttempts):
+            self.attempts += 1
+            engine.reset(numRows, numCols, numMines)
+            if mines is None:
+                engine.reveal(row, col)
+                mines = engine.mineLocations
+            else:
+                engine.start(mines, row, col)
+            self.solver.reset()
+
+            finished, numRepairs = self.solve(rng)
+            if not finished:
+                mines = None
+                continue
+            if numRepairs == 0:
+                break
+            mines = np.flatnonzero(engine.board.numbers.ravel() == MINE)
+        else:
+            self.failures += 1
+            mines = seededMines(numRows, numCols, numMines, row, col, seed)
+
+        self.boards += 1
+        self.seconds += time.perf_counter() - start
+        return mines
+
+
+
+    def solve(self, rng): # play the board from the first click, repairing it when it gets stuck. Returns whether it was finished, and the amount of repairs
+        engine, solver = self.engine, self.solver
+        numSafe = engine.numRows * engine.numCols - engine.numMines
+        numRepairs = 0
+        while True:
+            solver.deduce()
+            # once every mine is known, the player can open everything else
+            finished = np.count_nonzero(solver.safe) == numSafe or np.count_nonzero(solver.mines) == engine.numMines
+            if finished or numRepairs == self.maxRepairs or not self.repair(rng):
+                break
+            numRepairs += 1
+        self.repairs += numRepairs
+        return finished, numRepairs
+
+
+
+    def repair(self, rng):
+        ''' Move one mine from the stuck frontier to a tile no opened tile can see, and return False if there is nothing to move.
+            If the frontier has no mines left to move (the opened area is walled in by known mines) one of those is moved instead,
+            and if every closed tile is on the frontier, the mine is moved to another frontier tile'''
+        engine, solver = self.engine, self.solver
+        numbers = engine.board.numbers
+        frontier = solver.frontierTiles()
+        closed = ~solver.safe & (numbers != MINE)
+
+        sources = np.flatnonzero(frontier & (numbers == MINE))
+        if not len(sources):
+            sources = np.flatnonzero(solver.mines & blockSum(closed))
+        # anything closed that isn't on the frontier isn't next to an opened number (or it would be on the frontier), so its mine can't be seen
+        hidden = closed & ~frontier
+        destinations = np.flatnonzero(hidden) if hidden.any() else np.flatnonzero(closed)
+        if not len(sources) or not len(destinations):
+            return False
+        # a 50/50 between the last two unknown tiles stays one whichever of the two the mine is moved to, so the board is rejected straight away
+        if not hidden.any() and np.count_nonzero(~solver.safe & ~solver.mines) == 2:
+            return False
+
+        source = int(sources[rng.integers(len(sources))])
+        destination = int(destinations[rng.integers(len(destinations))])
+        moveMine(numbers, source, destination)
+        solver.mines[divmod(source, engine.numCols)] = False
+
+        # the known numbers next to the moved mine changed. One that became whitespace is a 0 to the solver, so the next deduce() opens the tiles
+        # around it, like they would have been in a game
+        return True
+
+
+
+    def throughput(self): # boards generated per second, so far
+        return self.boards / self.seconds if self.seconds else 0.0
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure how fast boards without guessing can be generated.')
+    parser.add_argument('--rows', type=int, default=16)
+    parser.add_argument('--cols', type=int, default=30)
+    parser.add_argument('--mines', type=int, default=99)
+    parser.add_argument('--boards', type=int, default=100)
+    parser.add_argument('--repairs', type=int, default=MAX_REPAIRS, help='mines moved before a board is rejected (0 rejects a board as soon as it gets stuck)')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    generator = NoGuessGenerator(args.repairs)
+    rng = np.random.default_rng(args.seed)
+    for board in range(args.boards):
+        generator(args.rows, args.cols, args.mines, args.rows // 2, args.cols // 2, int(rng.integers(1 << 63)))
+    msPerBoard = 1000 * generator.seconds / generator.boards
+    print('%d boards of %dx%d with %d mines in %.2f s: %.1f boards/s, %.2f ms per board (%d%% of a %.1f ms frame)'
+          % (generator.boards, args.rows, args.cols, args.mines, generator.seconds, generator.throughput(), msPerBoard, 100 * msPerBoard / FRAME_MS, FRAME_MS))
+    print('%.2f attempts and %.2f repairs per board, %d failures' % (generator.attempts / generator.boards, generator.repairs / generator.boards, generator.failures))
+
+
+
+if __name__ == '__main__':
+    main()
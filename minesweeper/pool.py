@@ -0,0 +1,75 @@
+import threading
+import numpy as np
+from .generation import relocatableLayout, relocateMines, seededMines, seedRng
+
+
+
+''' Mine layouts prepared ahead of time by a background thread, so the first click of a game doesn't have to generate one.
+    A BoardPool takes the same arguments as seededMines(), so it can be an Engine's mineGenerator, and gives exactly the same mines.
+
+    seededMines() works in two steps: a relocatable layout that only depends on the seed and the dimensions, then moving the (at most 9)
+    mines around the first click away. The pool does the first step in the background for seeds it picks itself, and nextSeed()
+    hands out the seed of a ready layout for the next game. At the first click only the second step is left, which costs the same
+    on any size of board. The pool only keeps layouts for the dimensions last given to setDimensions(), and any seed it
+    has no layout for goes to seededMines()'''
+class BoardPool():
+    def __init__(self, size=4):
+        self.size = size
+        self.rng = np.random.default_rng()  # only used with the lock held: Generators aren't thread safe
+        self.dimensions = None
+        self.layouts = {}   # seed -> relocatable layout, in the order they were made
+        self.claimed = {}   # the layout given out by the last nextSeed(), until its first click
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.work, daemon=True)
+        self.thread.start()
+
+
+
+    def setDimensions(self, numRows, numCols, numMines): # start preparing layouts for a new size of board, throwing away any of the old size
+        with self.condition:
+            if self.dimensions == (numRows, numCols, numMines):
+                return
+            self.dimensions = (numRows, numCols, numMines)
+            self.layouts.clear()
+            self.claimed.clear()
+            self.condition.notify()
+
+
+
+    def nextSeed(self): # the seed for the next game: one with a ready layout if there is one
+        with self.condition:
+            self.claimed.clear()
+            if not self.layouts:
+                return int(self.rng.integers(1 << 63))
+            seed = next(iter(self.layouts))
+            self.claimed[seed] = self.layouts.pop(seed)
+            self.condition.notify()
+            return seed
+
+
+
+    def work(self): # the background thread: keep the pool full, and sleep while it is
+        while True:
+            with self.condition:
+                while self.dimensions is None or len(self.layouts) >= self.size:
+                    self.condition.wait()
+                dimensions = self.dimensions
+                seed = int(self.rng.integers(1 << 63))
+
+            layout = relocatableLayout(*dimensions, seedRng(seed, *dimensions))
+
+            with self.condition:
+                if dimensions == self.dimensions:
+                    self.layouts[seed] = layout
+
+
+
+    def __call__(self, numRows, numCols, numMines, row, col, seed):
+        with self.condition:
+            layout = None
+            if self.dimensions == (numRows, numCols, numMines):
+                layout = self.claimed.pop(seed, None) or self.layouts.pop(seed, None)
+            self.condition.notify()
+        if layout is None:
+            return seededMines(numRows, numCols, numMines, row, col, seed)
+        return relocateMines(*layout, numRows, numCols, row, col, seedRng(seed, numRows, numCols, numMines, row, col))
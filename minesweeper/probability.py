@@ -0,0 +1,253 @@
+import numpy as np
+from math import lgamma
+from bisect import bisect_right
+from collections import OrderedDict
+from .board import OPENED, FLAGGED
+
+
+
+''' The chance of every closed tile being a mine, given what the player can see, for when the Solver can't prove any tile safe.
+    The frontier constraints of a Solver are split into components that share no unknown tiles, and each component is counted on its own:
+    for every amount of mines k, how many ways it can hold k mines (W[k]), and in how many of those each of its tiles is a mine.
+    The components are then combined with the tiles that aren't next to any number (the interior): a way to place k mines on the frontier
+    leaves C(interior tiles, mines left - k) ways to place the rest, which weights every k.
+
+    Counting goes through a component's tiles in frontier order and only remembers how many mines each number whose tiles are partly
+    decided has so far, so the work grows with the amount of those combinations instead of 2 ** tiles.
+    Components that don't change between moves are looked up from a cache instead of being counted again.
+    A component with more than maxStates combinations at once is estimated from random samples instead'''
+
+class TooManyStates(Exception):
+    pass
+
+
+
+class ProbabilityEngine():
+    def __init__(self, solver, maxStates=5000, numSamples=2000, rng=None, cacheSize=256):
+        self.solver = solver
+        self.maxStates = maxStates
+        self.numSamples = numSamples
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.cache = OrderedDict()  # component constraints -> (its tiles, W, mine counts per tile)
+        self.cacheSize = cacheSize
+
+
+
+    def probabilities(self):
+        ''' Returns a float array the shape of the board: 0 for opened and known safe tiles, 1 for flags and known mines,
+            and the chance of being a mine for every other tile'''
+        engine, solver = self.solver.engine, self.solver
+        state = engine.board.state.ravel()
+        result = np.zeros(engine.numRows * engine.numCols)
+        result[state & FLAGGED != 0] = 1
+        result[list(solver.mines)] = 1
+
+        unknown = state & (OPENED | FLAGGED) == 0
+        unknown[list(solver.safe)] = False
+        unknown[list(solver.mines)] = False
+
+        components = [self.countComponent(constraints) for constraints in self.components()]
+        frontier = np.zeros(len(state), dtype=bool)
+        for cells, W, mineCounts in components:
+            frontier[cells] = True
+        interior = unknown & ~frontier
+        numInterior = int(interior.sum())
+        minesLeft = engine.numMines - int((state & FLAGGED != 0).sum()) - len(solver.mines)
+
+        # everything = the combined W of all the components. others[j] = the combined W of every component but j
+        prefixes = [np.ones(1)]
+        for cells, W, mineCounts in components:
+            prefixes.append(np.convolve(prefixes[-1], W))
+        suffix = np.ones(1)
+        others = [None] * len(components)
+        for j in range(len(components) - 1, -1, -1):
+            others[j] = np.convolve(prefixes[j], suffix)
+            suffix = np.convolve(suffix, components[j][1])
+        everything = prefixes[-1]
+
+        weights = self.interiorWeights(len(everything), numInterior, minesLeft)
+        total = (everything * weights).sum()
+        if total == 0:
+            # the flags don't add up with the amount of mines (one of them must be misplaced), so every k is taken as equally likely
+            weights = np.ones(len(everything))
+            total = everything.sum()
+        if total == 0:
+            return result.reshape(engine.numRows, engine.numCols)
+
+        for (cells, W, mineCounts), other in zip(components, others):
+            for cell, counts in zip(cells, mineCounts):
+                result[cell] = (np.convolve(counts, other) * weights[:len(counts) + len(other) - 1]).sum() / total
+        if numInterior:
+            k = np.arange(len(everything))
+            result[interior] = (everything * weights * np.maximum(minesLeft - k, 0)).sum() / total / numInterior
+        return result.reshape(engine.numRows, engine.numCols)
+
+
+
+    def interiorWeights(self, length, numInterior, minesLeft): # C(numInterior, minesLeft - k) for every k, scaled so the largest is 1
+        logWeights = np.full(length, -np.inf)
+        for k in range(length):
+            m = minesLeft - k
+            if 0 <= m <= numInterior:
+                logWeights[k] = lgamma(numInterior + 1) - lgamma(m + 1) - lgamma(numInterior - m + 1)
+        if np.isneginf(logWeights).all():
+            return np.zeros(length)
+        return np.exp(logWeights - logWeights.max())
+
+
+
+    def components(self): # group the frontier constraints into lists that share unknown tiles, each list ordered from one end of the frontier
+        constraints = self.solver.constraints
+        cellConstraints = {}
+        for index, (cells, mines) in constraints.items():
+            for cell in cells:
+                cellConstraints.setdefault(cell, []).append(index)
+
+        seen = set()
+        components = []
+        for start in constraints:
+            if start in seen:
+                continue
+            seen.add(start)
+            component = [start]
+            for index in component:   # breadth-first, so neighbouring constraints end up next to each other
+                for cell in constraints[index][0]:
+                    for other in cellConstraints[cell]:
+                        if other not in seen:
+                            seen.add(other)
+                            component.append(other)
+            components.append([constraints[index] for index in component])
+        return components
+
+
+
+    def countComponent(self, constraints):
+        key = frozenset(constraints)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        # tiles are numbered in the order their constraints were reached, which keeps the amount of partly decided constraints small
+        cells = []
+        for constraintCells, mines in constraints:
+            cells.extend(sorted(constraintCells.difference(cells)))
+        try:
+            counted = self.count(cells, constraints)
+        except TooManyStates:
+            counted = self.sample(cells, constraints)
+
+        self.cache[key] = counted
+        if len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False)
+        return counted
+
+
+
+    def transitions(self, cells, constraints):
+        ''' Returns step(i, counts, isMine): the mine counts of the constraints still partly decided after tile i,
+            or None if tile i being a mine (or not) breaks one of its constraints'''
+        position = {cell: i for i, cell in enumerate(cells)}
+        numCells = len(cells)
+        cellConstraints = [[] for cell in cells]
+        last = []
+        remaining = []  # remaining[c][i] is how many tiles of constraint c come after tile i
+        for c, (constraintCells, mines) in enumerate(constraints):
+            positions = sorted(position[cell] for cell in constraintCells)
+            for i in positions:
+                cellConstraints[i].append(c)
+            last.append(positions[-1])
+            remaining.append([len(positions) - bisect_right(positions, i) for i in range(numCells)])
+        started = set()
+        active = []  # active[i] are the constraints partly decided after tile i, the order the counts are stored in
+        for i in range(numCells):
+            started.update(cellConstraints[i])
+            active.append(tuple(sorted(c for c in started if last[c] > i)))
+        mines = [mines for constraintCells, mines in constraints]
+
+        def step(i, counts, isMine):
+            counts = dict(zip(active[i - 1], counts)) if i else {}
+            for c in cellConstraints[i]:
+                count = counts.get(c, 0) + isMine
+                if count > mines[c] or count + remaining[c][i] < mines[c]:
+                    return None
+                counts[c] = count
+            return tuple(counts[c] for c in active[i])
+        return step
+
+
+
+    def count(self, cells, constraints): # forward and backward over the tiles, with the mines so far as a polynomial in k per set of counts
+        step = self.transitions(cells, constraints)
+        numCells = len(cells)
+
+        def shift(poly):
+            shifted = np.zeros(len(poly))
+            shifted[1:] = poly[:-1]
+            return shifted
+
+        start = np.zeros(numCells + 1)
+        start[0] = 1
+        forward = [{(): start}]
+        for i in range(numCells):
+            nextStates = {}
+            for counts, poly in forward[i].items():
+                for isMine in (0, 1):
+                    nextCounts = step(i, counts, isMine)
+                    if nextCounts is not None:
+                        moved = shift(poly) if isMine else poly
+                        nextStates[nextCounts] = nextStates[nextCounts] + moved if nextCounts in nextStates else moved
+            if len(nextStates) > self.maxStates:
+                raise TooManyStates
+            forward.append(nextStates)
+
+        backward = {(): start}
+        mineCounts = [None] * numCells
+        for i in range(numCells - 1, -1, -1):
+            states = {}
+            mineCount = np.zeros(numCells + 1)
+            for counts, poly in forward[i].items():
+                total = np.zeros(numCells + 1)
+                for isMine in (0, 1):
+                    nextCounts = step(i, counts, isMine)
+                    if nextCounts is None or nextCounts not in backward:
+                        continue
+                    rest = shift(backward[nextCounts]) if isMine else backward[nextCounts]
+                    total += rest
+                    if isMine:
+                        mineCount += np.convolve(poly, rest)[:numCells + 1]
+                states[counts] = total
+            backward = states
+            mineCounts[i] = mineCount
+
+        W = forward[numCells].get((), np.zeros(numCells + 1))
+        return self.normalized(cells, W, mineCounts)
+
+
+
+    def sample(self, cells, constraints):
+        ''' Estimates W and the mine counts with random walks through the tiles (Knuth's estimator): each walk picks uniformly between
+            the choices that don't break a constraint, and counts for the product of the amount of choices it had, so the estimates are unbiased'''
+        step = self.transitions(cells, constraints)
+        numCells = len(cells)
+        W = np.zeros(numCells + 1)
+        mineCounts = np.zeros((numCells, numCells + 1))
+        for sample in range(self.numSamples):
+            counts, weight, mines = (), 1.0, []
+            for i in range(numCells):
+                choices = [(isMine, nextCounts) for isMine in (0, 1) for nextCounts in [step(i, counts, isMine)] if nextCounts is not None]
+                if not choices:
+                    break
+                isMine, counts = choices[self.rng.integers(len(choices))] if len(choices) > 1 else choices[0]
+                weight *= len(choices)
+                if isMine:
+                    mines.append(i)
+            else:
+                W[len(mines)] += weight
+                mineCounts[mines, len(mines)] += weight
+        return self.normalized(cells, W, list(mineCounts))
+
+
+
+    def normalized(self, cells, W, mineCounts): # scale so the largest W is 1: only ratios matter, and big components would overflow otherwise
+        scale = W.max() or 1
+        return np.array(cells), W / scale, [counts / scale for counts in mineCounts]
@@ -0,0 +1,50 @@
+import pygame, time
+
+
+
+''' Keeps track of the parts of the window that have been drawn on since the last frame, so that present() only pushes those to the display
+    with pygame.display.update(rects) instead of flipping the whole window. If nothing was drawn, present() does nothing at all.
+    Anything that redraws most of the window (a new game, the game over screen) calls markEverything() and gets a regular flip()'''
+class Renderer():
+    def __init__(self, maxRects=200):
+        self.dirtyRects = []
+        self.everythingDirty = False
+        self.maxRects = maxRects  # past this many rects, a single rect covering all of them is cheaper for the display to update
+        self.stats = None  # a stats.Stats, when the game is measuring itself
+
+
+
+    def markDirty(self, rect):
+        if self.everythingDirty:
+            return
+        self.dirtyRects.append(pygame.Rect(rect))
+        if len(self.dirtyRects) > self.maxRects:
+            self.dirtyRects = [self.dirtyRects[0].unionall(self.dirtyRects[1:])]
+
+
+
+    def markEverything(self):
+        self.everythingDirty = True
+        self.dirtyRects = []
+
+
+
+    def present(self): # push everything drawn since the last call to the display, and return whether anything was pushed
+        start = time.perf_counter() if self.stats is not None else 0
+        if self.everythingDirty:
+            pygame.display.flip()
+            kind = 'flip'
+        elif self.dirtyRects:
+            pygame.display.update(self.dirtyRects)
+            kind = 'update'
+        else:
+            return False
+
+        if self.stats is not None:
+            self.stats.count(kind)
+            self.stats.timing(kind, start)
+            self.stats.presented()
+
+        self.dirtyRects = []
+        self.everythingDirty = False
+        return True
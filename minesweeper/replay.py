@@ -0,0 +1,250 @@
+import zlib
+from bisect import bisect_right
+import numpy as np
+from .engine import Engine
+from .chunked import ChunkedEngine
+from .encoding import packVarints, gameCode, gameMines, decodeGame
+
+MAGIC = b'MSRP'
+
+# record types. The action ones are the same as Gameboard.mouseClick()'s buttons, plus 0x10
+GAME, SNAPSHOT, END = 0x01, 0x02, 0x03
+REVEAL, CHORD, FLAG = 0x11, 0x12, 0x13
+ACTIONS = {REVEAL: 'reveal', CHORD: 'chord', FLAG: 'flag'}
+
+
+
+''' An append-only binary log of every move of every game, and a reader that can jump to any move of a game.
+    A log file is MAGIC followed by one block of records per game:
+        GAME      the game code (see encoding.py) and the Custom menu options: everything needed to play the game again
+        action    REVEAL, CHORD or FLAG, the game time in milliseconds since the last action, row and col: about 5 bytes.
+                  Flags placed before the first click have no game to go in yet, so they are held back and written right after the GAME record
+        SNAPSHOT  every snapshotInterval actions, the board state (zlib compressed) and counters after that many actions
+        END       the amount of actions in the game
+    All integers are varints (see encoding.packVarints()), and a game that was cut off without an END record can still be read.
+    Replay.engineAt(move) finds the last snapshot before the move with a binary search, and only plays the actions after it'''
+
+def zigzag(value): # a signed integer as a varint-friendly unsigned one: 0, -1, 1, -2, ... become 0, 1, 2, 3, ...
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+
+def unzigzag(value):
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+
+class ReplayWriter():
+    def __init__(self, path, snapshotInterval=64):
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.snapshotInterval = snapshotInterval
+        self.recording = False
+        self.game = None
+        self.pending = []  # (action, timestamp, row, col) of every move made before the first click
+
+
+
+    def record(self, engine, action, row, col, timestamp): # call after every move the Engine was given, with the game time in milliseconds
+        if self.recording and self.game != (engine, engine.seed):  # a new game was started without ending the last one
+            self.endGame()
+        if not self.recording:
+            # a game on a ChunkedBoard isn't recorded: a game code can't rebuild one, and its state isn't one array to snapshot
+            if isinstance(engine, ChunkedEngine):
+                return
+            if self.game != (engine, engine.seed):  # any moves held back were made in a game that never got its first click
+                self.game = (engine, engine.seed)
+                self.pending = []
+            # the mines are only placed on the first click, so until then there is no game code to write
+            if engine.firstClickTile is None:
+                self.pending.append((action, timestamp, row, col))
+                return
+            flags = engine.powerDoubleclickEnabled | engine.autoTileOpeningEnabled << 1
+            code = gameCode(engine).encode()
+            self.file.write(bytes([GAME]) + packVarints([len(code)]) + code + bytes([flags]))
+            self.recording = True
+            self.numActions = 0
+            self.lastTimestamp = 0
+            for pendingAction, pendingTimestamp, pendingRow, pendingCol in self.pending:
+                self.writeAction(engine, pendingAction, pendingRow, pendingCol, pendingTimestamp)
+            self.pending = []
+
+        self.writeAction(engine, action, row, col, timestamp)
+
+
+
+    def writeAction(self, engine, action, row, col, timestamp):
+        self.file.write(bytes([action]) + packVarints([max(timestamp - self.lastTimestamp, 0), row, col]))
+        self.lastTimestamp = max(timestamp, self.lastTimestamp)
+        self.numActions += 1
+        if self.numActions % self.snapshotInterval == 0:
+            self.writeSnapshot(engine)
+
+
+
+    def writeSnapshot(self, engine):
+        boardState, state, numMinesRemaining, numTilesRemaining, explodedTile = engine.snapshot()
+        exploded = explodedTile[0] * engine.numCols + explodedTile[1] + 1 if explodedTile is not None else 0
+        compressed = zlib.compress(boardState.tobytes(), 1)
+        self.file.write(bytes([SNAPSHOT]) + packVarints([self.numActions, state, zigzag(numMinesRemaining), numTilesRemaining, exploded, len(compressed)]) + compressed)
+
+
+
+    def endGame(self): # call when a game is over or abandoned
+        self.pending = []
+        if self.recording:
+            self.file.write(bytes([END]) + packVarints([self.numActions]))
+            self.file.flush()
+            self.recording = False
+
+
+
+    def close(self):
+        self.endGame()
+        self.file.close()
+
+
+
+class ByteReader(): # reads a file a chunk at a time, so a log of any size can be streamed
+    def __init__(self, file, chunkSize=1 << 20):
+        self.file = file
+        self.chunkSize = chunkSize
+        self.buffer = b''
+        self.position = 0
+        self.offset = 0   # where self.buffer starts in the file
+
+
+
+    def available(self, amount): # make sure amount bytes can be read, and return whether they can
+        if len(self.buffer) - self.position >= amount:
+            return True
+        self.offset += self.position
+        self.buffer = self.buffer[self.position:] + self.file.read(max(self.chunkSize, amount))
+        self.position = 0
+        return len(self.buffer) >= amount
+
+
+
+    def tell(self):
+        return self.offset + self.position
+
+
+
+    def read(self, amount):
+        if not self.available(amount):
+            raise EOFError
+        data = self.buffer[self.position:self.position + amount]
+        self.position += amount
+        return data
+
+
+
+    def byte(self):
+        if self.position >= len(self.buffer) and not self.available(1):
+            raise EOFError
+        self.position += 1
+        return self.buffer[self.position - 1]
+
+
+
+    def varint(self):
+        value, shift = 0, 0
+        while True:
+            byte = self.byte()
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+
+
+''' One recorded game. .actions is a list of (game time in milliseconds, 'reveal'/'chord'/'flag', row, col),
+    .snapshots the (amount of actions, file offset) of every snapshot, and .finished is False if the log was cut off before its END'''
+class Replay():
+    def __init__(self, path, code, flags):
+        self.path = path
+        self.code = code
+        self.numRows, self.numCols, self.numMines, self.firstRow, self.firstCol, self.seed, self.generator, self.settings = decodeGame(code)
+        self.powerDoubleclickEnabled = bool(flags & 1)
+        self.autoTileOpeningEnabled = bool(flags & 2)
+        self.actions = []
+        self.snapshots = []
+        self.finished = False
+        self.mines = None
+
+
+
+    def engineAt(self, move=None): # an Engine showing the game after the first `move` actions (all of them if not given)
+        move = len(self.actions) if move is None else move
+        if self.mines is None:
+            self.mines = gameMines(self.code)[5]
+        engine = Engine(self.numRows, self.numCols, self.numMines)
+        engine.reset(seed=self.seed)
+        engine.powerDoubleclickEnabled = self.powerDoubleclickEnabled
+        engine.autoTileOpeningEnabled = self.autoTileOpeningEnabled
+        mines = self.mines
+        engine.mineGenerator = lambda *arguments: mines.copy()
+
+        done = 0
+        i = bisect_right(self.snapshots, (move, float('inf'))) - 1
+        if i >= 0 and move:
+            done, offset = self.snapshots[i]
+            engine.firstClickTile = (self.firstRow, self.firstCol)
+            engine.start(mines.copy(), self.firstRow, self.firstCol)
+            engine.restore(self.readSnapshot(offset))
+        for timestamp, action, row, col in self.actions[done:move]:
+            getattr(engine, action)(row, col)
+        return engine
+
+
+
+    def readSnapshot(self, offset):
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            reader = ByteReader(file, 4096)
+            if reader.byte() != SNAPSHOT:
+                raise ValueError('no snapshot at offset %d of %s' % (offset, self.path))
+            numActions, state, numMinesRemaining, numTilesRemaining, exploded, length = (reader.varint() for i in range(6))
+            boardState = np.frombuffer(zlib.decompress(reader.read(length)), dtype=np.uint8).reshape(self.numRows, self.numCols)
+        explodedTile = divmod(exploded - 1, self.numCols) if exploded else None
+        return boardState, state, unzigzag(numMinesRemaining), numTilesRemaining, explodedTile
+
+
+
+def readReplays(path):
+    ''' Streams every game in a log as a Replay, one game at a time, without ever reading the whole file at once.
+        Snapshots are skipped over and only read when Replay.engineAt() needs them'''
+    with open(path, 'rb') as file:
+        reader = ByteReader(file)
+        if reader.read(4) != MAGIC:
+            raise ValueError('%s is not a replay log' % path)
+        replay = None
+        timestamp = 0
+        while True:
+            try:
+                recordType = reader.byte()
+                if recordType in ACTIONS:
+                    timestamp += reader.varint()
+                    replay.actions.append((timestamp, ACTIONS[recordType], reader.varint(), reader.varint()))
+                elif recordType == SNAPSHOT:
+                    offset = reader.tell() - 1
+                    numActions = reader.varint()
+                    for i in range(4):
+                        reader.varint()
+                    reader.read(reader.varint())
+                    replay.snapshots.append((numActions, offset))
+                elif recordType == GAME:
+                    if replay is not None:
+                        yield replay
+                    replay = Replay(path, reader.read(reader.varint()).decode(), reader.byte())
+                    timestamp = 0
+                elif recordType == END:
+                    reader.varint()
+                    replay.finished = True
+                else:
+                    raise ValueError('unknown record type %d at offset %d of %s' % (recordType, reader.tell() - 1, path))
+            except EOFError:  # the end of the file, or a record cut off by a crash
+                break
+        if replay is not None:
+            yield replay
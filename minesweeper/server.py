@@ -0,0 +1,376 @@
+''' A game server: many independent games, with no display, played by clients over a local TCP or Unix socket.
+    Usage examples:
+        python -m minesweeper.server --port 8765
+        python -m minesweeper.server --unix /tmp/minesweeper.sock --memory 256 --idle-timeout 60
+
+    Every game is a session holding one Engine, so bots and thin clients can share one process instead of running one game each.
+    A session is made by NEW and is kept until CLOSE, or until nothing has been asked of it for idleTimeout seconds. It doesn't belong
+    to a connection: one connection can play many sessions, and a client can reconnect and carry on with the same session id.
+
+    Every request and response is one frame. A request is a 2-byte big-endian length, then the opcode byte and its arguments as varints
+    (see encoding.packVarints()). A response is a 4-byte big-endian length, then a status byte and what the request returns:
+        NEW     session (0 for a new one), numRows, numCols, numMines, options (POWER_DOUBLECLICK | AUTO_TILE_OPENING), seed + 1 (0 for a random one)
+                -> session, seed. Giving the id of an existing session starts a new game in it, reusing its board
+        REVEAL, CHORD, FLAG  session, row, col (the same action codes as replay logs)
+                -> state, zigzag(numMinesRemaining), numTilesRemaining, count, the flat indices (row * numCols + col) of the count tiles
+                   that changed as deltas from the previous one, then count bytes holding the new kind of each (see board.tileKinds())
+                   When a move ends the game, every mine is in the changed tiles, showing what the game over screen shows
+        STATE   session -> state, zigzag(numMinesRemaining), numTilesRemaining, numRows, numCols, then the kind of every tile
+                   as bytes, zlib compressed: the whole board, for a client that (re)connects in the middle of a game
+        CLOSE   session -> nothing
+    Apart from the kinds, every value in a response is a varint. Any status other than OK is followed by an error message in UTF-8.
+
+    Each session reserves the most memory its Engine can ever use (see sessionMemory()) when its game starts: a game that would go over
+    maxSessionMemory is refused, and so is a new one that would take the total over maxMemory once idle sessions have been evicted.
+    Moves are played on the event loop itself. They take well under a millisecond on the boards the memory limits allow,
+    so thousands of sessions can be played at once without threads, and the requests of a connection are answered in order'''
+import argparse, asyncio, struct, time, zlib
+import numpy as np
+from collections import OrderedDict
+from .engine import Engine, LOST, WON
+from .board import tileKinds
+from .encoding import packVarints, unpackVarints
+from .replay import REVEAL, CHORD, FLAG, zigzag, unzigzag
+
+# opcodes, along with replay.REVEAL, CHORD and FLAG
+NEW, STATE, CLOSE = 0x01, 0x02, 0x03
+# NEW options, the same bits as the options of a replay log's GAME record
+POWER_DOUBLECLICK, AUTO_TILE_OPENING = 1, 2
+
+# response statuses
+OK, BAD_REQUEST, NO_SESSION, TOO_BIG, FULL = 0, 1, 2, 3, 4
+STATUS_NAMES = {BAD_REQUEST: 'bad request', NO_SESSION: 'no such session', TOO_BIG: 'game too big', FULL: 'server full'}
+
+REQUEST_HEADER = struct.Struct('>H')
+RESPONSE_HEADER = struct.Struct('>I')
+
+# what an Engine costs on top of its board (the object, its random generator and the session), then per tile: 2 bytes of board,
+# and a (row, col) tuple in Engine.satisfiedTiles if the tile is a satisfied number (measured with tracemalloc), then per mine
+SESSION_BYTES = 4096
+TILE_BYTES = 2 + 96
+MINE_BYTES = 8
+
+# defaults: enough for the Custom menu's largest board in a session, and about 15000 sessions of Expert
+MEMORY = 1 << 30
+SESSION_MEMORY = 1 << 20
+IDLE_TIMEOUT = 600
+EVICTION_INTERVAL = 5   # seconds between looking for idle sessions
+
+
+
+def sessionMemory(numRows, numCols, numMines): # the most memory a game of that size can need, however it is played
+    return SESSION_BYTES + numRows * numCols * TILE_BYTES + numMines * MINE_BYTES
+
+
+
+def readVarints(data, count, offset=0): # the first count varints of data from offset, and the offset after them
+    values = []
+    for i in range(count):
+        value, shift = 0, 0
+        while True:
+            if offset >= len(data):
+                raise ValueError('truncated data')
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        values.append(value)
+    return values, offset
+
+
+
+class RequestError(Exception): # a request that gets an error status instead of an answer
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+
+class Session():
+    def __init__(self, id):
+        self.id = id
+        self.engine = None
+        self.memory = 0         # what sessionMemory() reserved for the game being played
+        self.lastUsed = time.monotonic()
+
+
+
+class GameServer():
+    def __init__(self, maxMemory=MEMORY, maxSessionMemory=SESSION_MEMORY, idleTimeout=IDLE_TIMEOUT):
+        self.maxMemory = maxMemory
+        self.maxSessionMemory = maxSessionMemory
+        self.idleTimeout = idleTimeout
+        self.sessions = OrderedDict()   # id -> Session, the least recently used first
+        self.memoryUsed = 0
+        self.rng = np.random.default_rng()
+        self.numRequests = 0
+        self.numEvicted = 0
+
+
+
+    async def serve(self, host='127.0.0.1', port=8765, path=None): # serve on a Unix socket if path is given, otherwise on TCP, until cancelled
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handleConnection, path)
+        else:
+            server = await asyncio.start_server(self.handleConnection, host, port)
+        eviction = asyncio.create_task(self.evictForever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            eviction.cancel()
+
+
+
+    async def handleConnection(self, reader, writer):
+        try:
+            while True:
+                length, = REQUEST_HEADER.unpack(await reader.readexactly(REQUEST_HEADER.size))
+                writer.write(self.handle(await reader.readexactly(length)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass    # the client went away: its sessions stay until they are closed or evicted
+        finally:
+            writer.close()
+
+
+
+    def handle(self, request): # one request frame's payload -> a whole response frame
+        self.numRequests += 1
+        try:
+            if not request:
+                raise RequestError(BAD_REQUEST, 'empty request')
+            opcode, arguments = request[0], unpackVarints(request[1:])
+            if opcode == NEW and len(arguments) == 6:
+                payload = self.newGame(*arguments)
+            elif opcode in (REVEAL, CHORD, FLAG) and len(arguments) == 3:
+                payload = self.move(opcode, *arguments)
+            elif opcode == STATE and len(arguments) == 1:
+                payload = self.state(self.session(arguments[0]))
+            elif opcode == CLOSE and len(arguments) == 1:
+                self.close(self.session(arguments[0]))
+                payload = b''
+            else:
+                raise RequestError(BAD_REQUEST, 'unknown opcode %d or wrong number of arguments' % opcode)
+            response = bytes([OK]) + payload
+        except RequestError as error:
+            response = bytes([error.status]) + str(error).encode()
+        except ValueError as error:  # varints that don't end
+            response = bytes([BAD_REQUEST]) + str(error).encode()
+        return RESPONSE_HEADER.pack(len(response)) + response
+
+
+
+    def session(self, id): # the session with that id, which is now the most recently used
+        session = self.sessions.get(id)
+        if session is None:
+            raise RequestError(NO_SESSION, 'no session %d: it was closed, evicted or never made' % id)
+        session.lastUsed = time.monotonic()
+        self.sessions.move_to_end(id)
+        return session
+
+
+
+    def newGame(self, id, numRows, numCols, numMines, options, seed):
+        if numRows < 3 or numCols < 3 or not 1 <= numMines <= numRows * numCols - 9:
+            raise RequestError(BAD_REQUEST, '%d mines do not fit on %dx%d with the first click' % (numMines, numRows, numCols))
+        memory = sessionMemory(numRows, numCols, numMines)
+        if memory > self.maxSessionMemory:
+            raise RequestError(TOO_BIG, '%dx%d with %d mines needs %d bytes, sessions get %d' % (numRows, numCols, numMines, memory, self.maxSessionMemory))
+        session = self.session(id) if id else None
+        available = self.maxMemory - self.memoryUsed + (session.memory if session is not None else 0)
+        if memory > available:
+            self.evictIdle()
+            available = self.maxMemory - self.memoryUsed + (session.memory if session is not None else 0)
+            if memory > available:
+                raise RequestError(FULL, 'no memory left for another %d bytes' % memory)
+
+        if session is None:
+            id = int(self.rng.integers(1, 1 << 48))
+            while id in self.sessions:
+                id = int(self.rng.integers(1, 1 << 48))
+            session = self.sessions[id] = Session(id)
+        seed = seed - 1 if seed else int(self.rng.integers(1 << 63))
+        if session.engine is None:
+            session.engine = Engine(numRows, numCols, numMines)
+        session.engine.reset(numRows, numCols, numMines, seed)
+        session.engine.powerDoubleclickEnabled = bool(options & POWER_DOUBLECLICK)
+        session.engine.autoTileOpeningEnabled = bool(options & AUTO_TILE_OPENING)
+        self.memoryUsed += memory - session.memory
+        session.memory = memory
+        return packVarints([session.id, seed])
+
+
+
+    def move(self, action, id, row, col):
+        engine = self.session(id).engine
+        wasOver = engine.state in (LOST, WON)
+        if action == REVEAL:
+            tiles = engine.reveal(row, col)
+        elif action == CHORD:
+            tiles = engine.chord(row, col)
+        else:
+            tiles = engine.flag(row, col)
+
+        # most moves change a handful of tiles, where sets and lists are quicker than arrays
+        indices = {i * engine.numCols + j for i, j in tiles}
+        gameOver = None
+        if engine.state in (LOST, WON) and not wasOver:
+            # the game over screen shows every mine, and the one that exploded
+            indices.update(engine.mineLocations.tolist())
+        indices = sorted(indices)
+        header = [engine.state, zigzag(engine.numMinesRemaining), engine.numTilesRemaining, len(indices)]
+        if not indices:
+            return packVarints(header)
+
+        if engine.state in (LOST, WON) and not wasOver:
+            exploded = engine.explodedTile[0] * engine.numCols + engine.explodedTile[1] if engine.explodedTile is not None else -1
+            gameOver = (engine.state == WON, np.array(indices) == exploded)
+        kinds = tileKinds(engine.board.numbers.ravel()[indices], engine.board.state.ravel()[indices], gameOver)
+        deltas = [index - previous for previous, index in zip([0] + indices, indices)]
+        return packVarints(header + deltas) + kinds.astype(np.uint8).tobytes()
+
+
+
+    def state(self, session):
+        engine = session.engine
+        gameOver = None
+        if engine.state in (LOST, WON):
+            exploded = np.zeros((engine.numRows, engine.numCols), dtype=bool)
+            if engine.explodedTile is not None:
+                exploded[engine.explodedTile] = True
+            gameOver = (engine.state == WON, exploded)
+        kinds = tileKinds(engine.board.numbers, engine.board.state, gameOver).astype(np.uint8)
+        header = [engine.state, zigzag(engine.numMinesRemaining), engine.numTilesRemaining, engine.numRows, engine.numCols]
+        return packVarints(header) + zlib.compress(kinds.tobytes(), 1)
+
+
+
+    def close(self, session):
+        del self.sessions[session.id]
+        self.memoryUsed -= session.memory
+
+
+
+    def evictIdle(self): # close every session nothing was asked of for idleTimeout seconds, and return how many there were
+        oldest = time.monotonic() - self.idleTimeout
+        evicted = 0
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.lastUsed > oldest:
+                break
+            self.close(session)
+            evicted += 1
+        self.numEvicted += evicted
+        return evicted
+
+
+
+    async def evictForever(self):
+        while True:
+            await asyncio.sleep(min(EVICTION_INTERVAL, self.idleTimeout))
+            self.evictIdle()
+
+
+
+''' A connection to a GameServer, for bots and tests. Every method sends one request and waits for its response,
+    and an error status is raised as a ValueError. Many Clients can play at once on the same event loop'''
+class Client():
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765, path=None):
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+
+
+    async def request(self, opcode, arguments): # send a request, and return the payload of its response
+        request = bytes([opcode]) + packVarints(arguments)
+        self.writer.write(REQUEST_HEADER.pack(len(request)) + request)
+        length, = RESPONSE_HEADER.unpack(await self.reader.readexactly(RESPONSE_HEADER.size))
+        response = await self.reader.readexactly(length)
+        if response[0] != OK:
+            raise ValueError('%s: %s' % (STATUS_NAMES.get(response[0], 'status %d' % response[0]), response[1:].decode()))
+        return response[1:]
+
+
+
+    async def newGame(self, numRows, numCols, numMines, options=0, seed=None, session=0): # returns (session, seed)
+        return tuple(unpackVarints(await self.request(NEW, [session, numRows, numCols, numMines, options, seed + 1 if seed is not None else 0])))
+
+
+
+    async def move(self, action, session, row, col):
+        ''' Returns (state, numMinesRemaining, numTilesRemaining, indices, kinds): the flat indices of the tiles that changed
+            and what each of them shows now, as arrays'''
+        payload = await self.request(action, [session, row, col])
+        (state, mines, tiles, count), offset = readVarints(payload, 4)
+        deltas, offset = readVarints(payload, count, offset)
+        kinds = np.frombuffer(payload, dtype=np.uint8, count=count, offset=offset)
+        return state, unzigzag(mines), tiles, np.cumsum(np.array(deltas, dtype=np.int64)), kinds
+
+
+
+    async def reveal(self, session, row, col):
+        return await self.move(REVEAL, session, row, col)
+
+
+
+    async def chord(self, session, row, col):
+        return await self.move(CHORD, session, row, col)
+
+
+
+    async def flag(self, session, row, col):
+        return await self.move(FLAG, session, row, col)
+
+
+
+    async def state(self, session): # returns (state, numMinesRemaining, numTilesRemaining, kinds), kinds being the numRows x numCols board
+        payload = await self.request(STATE, [session])
+        (state, mines, tiles, numRows, numCols), offset = readVarints(payload, 5)
+        kinds = np.frombuffer(zlib.decompress(payload[offset:]), dtype=np.uint8).reshape(numRows, numCols)
+        return state, unzigzag(mines), tiles, kinds
+
+
+
+    async def close(self, session):
+        await self.request(CLOSE, [session])
+
+
+
+    async def disconnect(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m minesweeper.server', description='Host many headless Minesweeper games over a local socket.')
+    parser.add_argument('--host', default='127.0.0.1', help='the address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='the TCP port to listen on (default: 8765)')
+    parser.add_argument('--unix', metavar='PATH', help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--memory', type=int, default=MEMORY >> 20, help='the memory all sessions can reserve, in MiB (default: %d)' % (MEMORY >> 20))
+    parser.add_argument('--session-memory', type=int, default=SESSION_MEMORY >> 10, help='the memory one session can reserve, in KiB (default: %d)' % (SESSION_MEMORY >> 10))
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT, help='seconds without a request before a session is evicted (default: %d)' % IDLE_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.memory << 20, args.session_memory << 10, args.idle_timeout)
+    print('serving on %s' % (args.unix or '%s:%d' % (args.host, args.port)))
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print('%d requests, %d sessions open, %d evicted' % (server.numRequests, len(server.sessions), server.numEvicted))
+
+
+
+if __name__ == '__main__':
+    main()
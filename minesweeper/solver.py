@@ -0,0 +1,321 @@
+import numpy as np
+from .board import OPENED, FLAGGED
+from .generation import WHITESPACE
+from .cascade import neighbourOffsets
+
+
+
+# the 3x3 block around a tile, as (row, col) offsets
+BLOCK = [(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1)]
+# the numbers B that can share an unknown tile with a number A are the ones at most 2 tiles away. Only half of them are listed,
+# since B at (di, dj) from A is A at (-di, -dj) from B
+PAIR_OFFSETS = [(di, dj) for di in range(0, 3) for dj in range(-2, 3) if di > 0 or dj > 0]
+PADDING = 3  # a tile around a number 2 tiles away is up to 3 tiles away
+
+
+
+def pairTiles(di, dj): # for a number A and a number B at (di, dj) from it: the offsets from A of the tiles around both, around B only and around A only
+    aroundA = set(BLOCK)
+    aroundB = {(di + i, dj + j) for i, j in BLOCK}
+    return sorted(aroundA & aroundB), sorted(aroundB - aroundA), sorted(aroundA - aroundB)
+
+
+
+def flatPairOffsets(width):
+    ''' PAIR_OFFSETS and pairTiles() as flat index offsets on a board width tiles wide: (offsets of B, shared tiles, B's own tiles, A's own tiles),
+        with one row per pair. Rows are made the same length: the shared tiles are counted, so theirs are filled up with A itself,
+        which is never unknown; the others are marked, so repeating one of them is harmless'''
+    def flat(tiles, length, filler):
+        return [i * width + j for i, j in tiles] + [filler] * (length - len(tiles))
+    pairs = [pairTiles(di, dj) for di, dj in PAIR_OFFSETS]
+    return (np.array([di * width + dj for di, dj in PAIR_OFFSETS]),
+            np.array([flat(shared, 6, 0) for shared, onlyB, onlyA in pairs]),
+            np.array([flat(onlyB, 8, onlyB[0][0] * width + onlyB[0][1]) for shared, onlyB, onlyA in pairs]),
+            np.array([flat(onlyA, 8, onlyA[0][0] * width + onlyA[0][1]) for shared, onlyB, onlyA in pairs]))
+
+
+
+def blockSum(tiles): # the sum of the 3x3 block around every tile. For bool tiles, whether any tile in the block is True
+    rows = tiles.copy()
+    rows[1:] += tiles[:-1]
+    rows[:-1] += tiles[1:]
+    result = rows.copy()
+    result[:, 1:] += rows[:, :-1]
+    result[:, :-1] += rows[:, 1:]
+    return result
+
+
+
+''' Works out which closed tiles are certainly safe and which are certainly mines, from what the player can see.
+    Every opened number next to closed tiles (the frontier) is a constraint: its unknown neighbours hold exactly `mines` mines.
+    Flags count as mines, just like they do when chording.
+
+    The Solver follows one Engine: after every move, pass update() the list of changed tiles the Engine returned.
+    Only the constraints of those tiles and their neighbours are rebuilt and checked again, so a move costs time proportional
+    to what it changed, never to the size of the board. .safe and .mines are the flat indices (row * numCols + col) of every tile
+    worked out so far that hasn't been opened or flagged yet; safeTiles() and mineTiles() give them as (row, col)'''
+class Solver():
+    def __init__(self, engine):
+        self.engine = engine
+        self.reset()
+
+
+
+    def reset(self): # call this after the Engine is reset
+        self.numRows, self.numCols = self.engine.numRows, self.engine.numCols
+        self.offsets = neighbourOffsets(self.numRows, self.numCols)
+        self.neighbourCache = {}
+        # reading single tiles from memoryviews of the board's arrays gives plain ints, which is much faster than indexing the arrays themselves
+        self.numbers = memoryview(self.engine.board.numbers.ravel())
+        self.state = memoryview(self.engine.board.state.ravel())
+        # flat index of a frontier number -> (frozenset of its unknown neighbours, amount of mines among them)
+        self.constraints = {}
+        self.safe = set()
+        self.mines = set()
+        self.dirty = []  # constraints that changed since they were last checked
+
+
+
+    def neighbours(self, index): # remembered per tile, since the tiles around the frontier are asked for over and over
+        neighbours = self.neighbourCache.get(index)
+        if neighbours is None:
+            row, col = divmod(index, self.numCols)
+            kind = (row > 0) | (row < self.numRows - 1) << 1 | (col > 0) << 2 | (col < self.numCols - 1) << 3
+            neighbours = self.neighbourCache[index] = [index + offset for offset in self.offsets[kind]]
+        return neighbours
+
+
+
+    def nearbyConstraints(self, index): # the frontier numbers at most 2 tiles away: the only ones that can share an unknown tile with index
+        row, col = divmod(index, self.numCols)
+        nearby = []
+        for i in range(max(row - 2, 0), min(row + 3, self.numRows)):
+            for j in range(max(col - 2, 0), min(col + 3, self.numCols)):
+                other = i * self.numCols + j
+                if other != index and other in self.constraints:
+                    nearby.append(other)
+        return nearby
+
+
+
+    def update(self, changedTiles): # take in the tiles a move opened or (un)flagged, and work out everything that follows from them
+        state = self.state
+        touched = set()
+        for row, col in changedTiles:
+            index = row * self.numCols + col
+            if state[index] & (OPENED | FLAGGED):
+                self.safe.discard(index)
+                self.mines.discard(index)
+            touched.add(index)
+            touched.update(self.neighbours(index))
+
+        for index in touched:
+            self.rebuild(index)
+        self.propagate()
+
+
+
+    def rebuild(self, index): # work out the constraint of one tile again from the board, if it is an opened number
+        state = self.state
+        if not state[index] & OPENED or not 1 <= self.numbers[index] <= 8:
+            self.constraints.pop(index, None)
+            return
+
+        unknown = []
+        mines = self.numbers[index]
+        for neighbour in self.neighbours(index):
+            if state[neighbour] & FLAGGED or neighbour in self.mines:
+                mines -= 1
+            elif not state[neighbour] & OPENED and neighbour not in self.safe:
+                unknown.append(neighbour)
+
+        # a number with no unknown tiles left isn't part of the frontier anymore. One that can't be satisfied has a misplaced flag next to it,
+        # and nothing that follows from it can be trusted
+        if not unknown or not 0 <= mines <= len(unknown):
+            self.constraints.pop(index, None)
+            return
+        cells = frozenset(unknown)
+        if self.constraints.get(index) != (cells, mines):
+            self.constraints[index] = (cells, mines)
+            self.dirty.append(index)
+
+
+
+    def deduce(self, cells, isMine):
+        (self.mines if isMine else self.safe).update(cells)
+        touched = set()
+        for cell in cells:
+            touched.update(self.neighbours(cell))
+        for index in touched:
+            self.rebuild(index)
+
+
+
+    def propagate(self):
+        ''' Check every dirty constraint until nothing new can be worked out.
+            single tile rule: if a number needs no more mines its unknown tiles are safe, if it needs all of them they are all mines.
+            pair rule: for two numbers A and B sharing unknown tiles, the mines in the shared tiles are at least A.mines - |only A|
+            and at most A.mines. If that forces B's own tiles to be all mines or all safe, then so be it (this covers subsets too)'''
+        while self.dirty:
+            index = self.dirty.pop()
+            if index not in self.constraints:
+                continue
+            cells, mines = self.constraints[index]
+            if mines == 0:
+                self.deduce(cells, False)
+                continue
+            if mines == len(cells):
+                self.deduce(cells, True)
+                continue
+
+            for other in self.nearbyConstraints(index):
+                otherCells, otherMines = self.constraints[other]
+                if cells.isdisjoint(otherCells):
+                    continue
+                onlyHere, onlyOther = cells - otherCells, otherCells - cells
+                if otherMines - mines == len(onlyOther):
+                    newMines, newSafe = onlyOther, onlyHere
+                elif mines - otherMines == len(onlyHere):
+                    newMines, newSafe = onlyHere, onlyOther
+                elif mines - len(onlyHere) == otherMines:
+                    newMines, newSafe = (), onlyOther
+                elif otherMines - len(onlyOther) == mines:
+                    newMines, newSafe = (), onlyHere
+                else:
+                    continue
+                if newMines or newSafe:
+                    self.deduce(newMines, True)
+                    self.deduce(newSafe, False)
+                    # both constraints were rebuilt, so this one is checked again from the start if it is still on the frontier
+                    self.dirty.append(index)
+                    break
+
+
+
+    def safeTiles(self):
+        return [divmod(index, self.numCols) for index in self.safe]
+
+
+
+    def mineTiles(self):
+        return [divmod(index, self.numCols) for index in self.mines]
+
+
+
+''' The Solver's rules worked out for the whole board at once, over numpy arrays instead of one constraint at a time.
+    Rules that are applied until nothing new follows always end up at the same tiles, so a board one of them can finish,
+    the other one can finish too. The Solver is cheaper for following a game move by move; this is cheaper for playing
+    a whole board in one go, like a noguess.NoGuessGenerator does. Flags are ignored: only .mines counts as mines.
+
+    deduce() works out everything that follows from the opened tiles and returns the closed tiles proven safe, without opening them:
+    the number under a tile is used as soon as the tile is proven safe (whitespace counts as a 0, which opens the tiles around it).
+    .safe is every tile known to be safe (opened or not), and .mines every mine worked out so far, as bool arrays shaped like the board.
+    Underneath, every array is a flat copy of the board with PADDING tiles of nothing around it, so the tiles around a tile
+    are always at the same flat offsets from it and neither rule ever has to check the edges of the board'''
+class ArraySolver():
+    def __init__(self, engine):
+        self.engine = engine
+        self.width = None
+        self.reset()
+
+
+
+    def reset(self): # call this after the Engine is reset
+        numRows, numCols = self.engine.numRows, self.engine.numCols
+        if self.width != numCols + 2 * PADDING:
+            self.width = numCols + 2 * PADDING
+            self.pairOffsets, self.sharedOffsets, self.onlyBOffsets, self.onlyAOffsets = flatPairOffsets(self.width)
+        size = (numRows + 2 * PADDING) * self.width
+        self.onBoard = np.zeros(size, dtype=bool)
+        self.tiles(self.onBoard)[...] = True
+        self.paddedSafe = np.zeros(size, dtype=bool)
+        self.paddedMines = np.zeros(size, dtype=bool)
+        self.safe, self.mines = self.tiles(self.paddedSafe), self.tiles(self.paddedMines)
+        self.unknown = np.zeros(size, dtype=bool)
+        self.frontier = np.zeros(size, dtype=bool)  # safe tiles next to unknown tiles
+        self.needed = np.zeros(size, dtype=np.int8)  # mines each safe tile still needs around it
+        self.unknownCounts = np.zeros(size, dtype=np.int8)
+
+
+
+    def tiles(self, padded): # the board-shaped view of a padded array
+        return padded.reshape(-1, self.width)[PADDING:-PADDING, PADDING:-PADDING]
+
+
+
+    def around(self, padded): # blockSum() of a padded array. The outer rows and columns of the padding are left at 0
+        width = self.width
+        rows = padded[:-2] + padded[1:-1]
+        rows += padded[2:]
+        result = np.zeros(padded.shape, dtype=padded.dtype)
+        block = result[width + 1:-width - 1]
+        np.add(rows[:-2 * width], rows[width:-width], out=block)
+        block += rows[2 * width:]
+        return result
+
+
+
+    def deduce(self):
+        board = self.engine.board
+        opened = board.state & OPENED != 0
+        numbers = np.zeros(self.needed.shape, dtype=np.int8)
+        self.tiles(numbers)[...] = np.where(board.numbers == WHITESPACE, 0, board.numbers)
+        self.safe |= opened
+        self.needed = numbers - self.around(self.paddedMines.view(np.int8))
+        self.unknown = self.onBoard & ~(self.paddedSafe | self.paddedMines)
+        while True:
+            self.unknownCounts = self.around(self.unknown.view(np.int8))
+            self.frontier = self.paddedSafe & (self.unknownCounts > 0)
+            # np.count_nonzero() is the cheapest way to ask whether an array is all False, and this loop asks a lot
+            safe, mines = self.singleRule()
+            if not np.count_nonzero(safe) and not np.count_nonzero(mines):
+                safe, mines = self.pairRule()
+                if not np.count_nonzero(safe) and not np.count_nonzero(mines):
+                    return self.safe & ~opened
+            # what the rules find is always unknown, so it can be taken out of .unknown by flipping it
+            self.paddedSafe |= safe
+            self.unknown ^= safe
+            if np.count_nonzero(mines):
+                self.paddedMines |= mines
+                self.unknown ^= mines
+                self.needed -= self.around(mines.view(np.int8))
+
+
+
+    def singleRule(self): # a number that needs no more mines has only safe tiles around it, one that needs all of them has only mines
+        found = []
+        for numbers in (self.frontier & (self.needed == 0), self.frontier & (self.needed == self.unknownCounts)):
+            found.append(self.around(numbers) & self.unknown if np.count_nonzero(numbers) else numbers)
+        return found
+
+
+
+    def pairRule(self):
+        ''' Solver.propagate()'s pair rule, for every frontier number A and the frontier numbers B at most 2 tiles away from it at once.
+            The shared tiles hold at least A.needed - |only A| mines and at most A.needed, so when B.needed - A.needed == |only B|,
+            B's own tiles are mines and A's own are safe, and when A.needed - |only A| == B.needed, B's own tiles are safe.
+            Each pair is looked at once, from the A with the smaller flat index, with the two rules checked both ways round.
+            Every array is one row per frontier number and one column per offset of B, so only the frontier is ever looked at'''
+        tilesA = np.flatnonzero(self.frontier)
+        tilesB = tilesA[:, None] + self.pairOffsets
+        numShared = self.unknown.view(np.int8)[tilesA[:, None, None] + self.sharedOffsets].sum(axis=2)
+        pairs = self.frontier[tilesB] & (numShared > 0)
+        neededA, neededB = self.needed[tilesA][:, None], self.needed[tilesB]
+        numOnlyA, numOnlyB = self.unknownCounts[tilesA][:, None] - numShared, self.unknownCounts[tilesB] - numShared
+        minesAtB = pairs & (neededB - neededA == numOnlyB)
+        minesAtA = pairs & (neededA - neededB == numOnlyA)
+        safeAtB = minesAtA | pairs & (neededA - numOnlyA == neededB)
+        safeAtA = minesAtB | pairs & (neededB - numOnlyB == neededA)
+
+        safe = np.zeros(self.frontier.shape, dtype=bool)
+        mines = np.zeros(self.frontier.shape, dtype=bool)
+        for marked, found, offsets in ((mines, minesAtB, self.onlyBOffsets), (mines, minesAtA, self.onlyAOffsets),
+                                       (safe, safeAtB, self.onlyBOffsets), (safe, safeAtA, self.onlyAOffsets)):
+            rows, pairIndices = np.nonzero(found)
+            marked[tilesA[rows][:, None] + offsets[pairIndices]] = True
+        return safe & self.unknown, mines & self.unknown
+
+
+
+    def frontierTiles(self): # the unknown tiles next to a safe tile, as of the last deduce()
+        return self.tiles(self.around(self.frontier) & self.unknown)
@@ -0,0 +1,128 @@
+import json, time
+from collections import Counter
+
+
+
+class Histogram(): # values counted in power-of-2 buckets: adding one is O(1) and the memory used never grows
+    def __init__(self):
+        self.buckets = [0] * 40  # bucket b counts the values v with int(v).bit_length() == b, i.e. 2**(b-1) <= v < 2**b
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+
+
+    def add(self, value):
+        self.buckets[min(int(value).bit_length(), 39)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+
+
+    def percentile(self, p): # an upper bound of the p-th percentile: the top of the bucket it falls in
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, amount in enumerate(self.buckets):
+            seen += amount
+            if amount and seen >= rank:
+                return min(1 << bucket, self.max)
+        return 0
+
+
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.total / self.count if self.count else 0, 'p50': self.percentile(50),
+                'p95': self.percentile(95), 'p99': self.percentile(99), 'max': self.max,
+                'buckets': {'<%d' % (1 << bucket): amount for bucket, amount in enumerate(self.buckets) if amount}}
+
+
+
+''' Counters and timing histograms for the hot paths of the game, to tell whether a slow frame was spent in the Engine or on drawing.
+    Nothing is measured unless the game is started with --stats or --overlay: everything that measures holds a Stats object that is
+    None otherwise, and checks that before doing anything, so with stats off a move or a frame costs one attribute check more.
+
+    What is measured (durations in microseconds):
+        reveal, chord, flag    time spent in the Engine per move, and counters of each
+        cascade                tiles opened per reveal         chain    tiles opened per chord, or per flag with auto tile opening on
+        draw                   time per Gameboard.drawTiles()  blits    counter of tiles drawn
+        flip, update           time per Renderer.present() that flipped the whole window or updated parts of it, and counters of each
+        frame                  time per main loop iteration, from the events arriving to the window being updated
+        latency                from a MOUSEBUTTONUP being handled to the window showing its result being updated'''
+class Stats():
+    def __init__(self):
+        self.counters = Counter()
+        self.histograms = {}
+        self.pendingClicks = []  # when each MOUSEBUTTONUP not shown on the window yet was handled
+        self.frameStart = None
+        self.startTime = time.perf_counter()
+
+
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+
+
+    def record(self, name, value): # add a value to a histogram
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(value)
+
+
+
+    def timing(self, name, start): # add the time since start (a time.perf_counter()) to a histogram, in microseconds
+        self.record(name, (time.perf_counter() - start) * 1000000)
+
+
+
+    def startFrame(self):
+        self.frameStart = time.perf_counter()
+
+
+
+    def endFrame(self):
+        if self.frameStart is not None:
+            self.timing('frame', self.frameStart)
+            self.frameStart = None
+
+
+
+    def cancelFrame(self): # the frame is waiting on the user (the game over screen, the menus), so how long it takes means nothing
+        self.frameStart = None
+
+
+
+    def click(self): # a MOUSEBUTTONUP is being handled
+        self.pendingClicks.append(time.perf_counter())
+
+
+
+    def presented(self): # the window was just updated, so every pending click is now showing its result
+        now = time.perf_counter()
+        for clickTime in self.pendingClicks:
+            self.record('latency', (now - clickTime) * 1000000)
+        self.pendingClicks = []
+
+
+
+    def overlayText(self, short=False): # a summary that fits in the bottom bar: the 95th percentiles of frame time and click latency
+        frame, latency = self.histograms.get('frame'), self.histograms.get('latency')
+        frameMs = frame.percentile(95) / 1000 if frame else 0
+        latencyMs = latency.percentile(95) / 1000 if latency else 0
+        if short:
+            return '%.1f/%.1fms' % (frameMs, latencyMs)
+        return 'frame %.1fms  click %.1fms' % (frameMs, latencyMs)
+
+
+
+    def summary(self):
+        return {'seconds': time.perf_counter() - self.startTime, 'counters': dict(self.counters),
+                'histograms': {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}}
+
+
+
+    def dump(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.summary(), file, indent=1)
@@ -0,0 +1,172 @@
+import numpy as np
+import pygame
+from .board import tileKinds
+from .atlas import NUMBER_COLORS
+
+# the tile sizes the viewport zooms through, on top of the tile size picked in the menus
+ZOOM_LEVELS = [1, 2, 3, 4, 6, 8, 11, 15, 20, 28, 36, 50]
+# tiles smaller than this are drawn as plain colored cells instead of from the TileAtlas: numbers and flags are unreadable anyway
+LOD_TILESIZE = 8
+# the color of the parts of the viewport the board doesn't cover, once it is zoomed out far enough
+BACKGROUND = (60, 60, 72)
+
+
+
+def blend(color, background, amount): # color mixed into background: numbers are tinted cells in level of detail mode
+    return tuple(int(c * amount + b * (1 - amount)) for c, b in zip(color, background))
+
+
+
+LOD_COLORS = np.array([
+    [(104, 113, 255), (100, 108, 248)],
+    [(250, 205, 50), (240, 195, 40)],
+    *([blend(color, (251, 250, 251), .55 if number else 0), blend(color, (245, 245, 245), .55 if number else 0)] for number, color in enumerate(NUMBER_COLORS)),
+    [(60, 70, 200), (55, 65, 190)],
+    [(70, 190, 80), (60, 180, 70)],
+    [(230, 50, 50), (230, 50, 50)],
+], dtype=np.uint8)
+
+
+
+''' The part of the board that is on screen, so that the window doesn't have to be as big as the board and only what can be seen is drawn.
+    .x and .y are the board pixel (at the current tile size) in the viewport's top left corner, and width x height is the viewport's size
+    in the window. pan() and zoom() move it around, and draw() draws everything in it: at tile sizes below LOD_TILESIZE every tile is a plain
+    colored cell, written to the window in one step with pygame.surfarray, so drawing costs the same at any zoom.
+    Either way the cost of drawing depends on the viewport's area, and never on the board's'''
+class Viewport():
+    def __init__(self, numRows, numCols, tilesize, width, height):
+        self.numRows = numRows
+        self.numCols = numCols
+        self.width = width
+        self.height = height
+        self.x, self.y = 0, 0
+        self.setTilesize(tilesize)
+
+
+
+    def setTilesize(self, tilesize):
+        self.tilesize = tilesize
+        self.lod = tilesize < LOD_TILESIZE
+        self.clamp()
+
+
+
+    def clamp(self): # keep as much of the board in view as possible
+        self.x = max(0, min(self.x, self.numCols * self.tilesize - self.width))
+        self.y = max(0, min(self.y, self.numRows * self.tilesize - self.height))
+
+
+
+    def pan(self, dx, dy): # move by (dx, dy) pixels, and return whether anything moved
+        position = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self.clamp()
+        return (self.x, self.y) != position
+
+
+
+    def zoom(self, steps, x, y):
+        ''' Zoom in (positive steps) or out (negative steps) through ZOOM_LEVELS, keeping the board pixel at (x, y) of the viewport in place.
+            It stops zooming out at the first level that fits the whole board in the viewport. Returns whether the tile size changed'''
+        levels = sorted(set(ZOOM_LEVELS) | {self.tilesize})
+        smallest = 0
+        while smallest < len(levels) - 1 and self.numCols * levels[smallest + 1] <= self.width and self.numRows * levels[smallest + 1] <= self.height:
+            smallest += 1
+        tilesize = levels[max(smallest, min(levels.index(self.tilesize) + steps, len(levels) - 1))]
+        if tilesize == self.tilesize:
+            return False
+
+        boardX, boardY = (self.x + x) / self.tilesize, (self.y + y) / self.tilesize
+        self.x, self.y = int(boardX * tilesize - x), int(boardY * tilesize - y)
+        self.setTilesize(tilesize)
+        return True
+
+
+
+    def visibleRange(self): # (first row, last row + 1, first col, last col + 1) of the tiles that are at least partly in view
+        tilesize = self.tilesize
+        return (self.y // tilesize, min(-(-(self.y + self.height) // tilesize), self.numRows),
+                self.x // tilesize, min(-(-(self.x + self.width) // tilesize), self.numCols))
+
+
+
+    def numVisible(self):
+        firstRow, lastRow, firstCol, lastCol = self.visibleRange()
+        return (lastRow - firstRow) * (lastCol - firstCol)
+
+
+
+    def isVisible(self, row, col):
+        firstRow, lastRow, firstCol, lastCol = self.visibleRange()
+        return firstRow <= row < lastRow and firstCol <= col < lastCol
+
+
+
+    def tileAt(self, x, y): # the (row, col) of the tile at (x, y) of the viewport, or None if there is no tile there
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        row, col = (self.y + y) // self.tilesize, (self.x + x) // self.tilesize
+        if row >= self.numRows or col >= self.numCols:
+            return None
+        return row, col
+
+
+
+    def tilePosition(self, row, col): # where a tile's top left corner is in the viewport
+        return col * self.tilesize - self.x, row * self.tilesize - self.y
+
+
+
+    def draw(self, surface, atlas, board, gameOver=None):
+        ''' Draw every visible tile on surface (the viewport's part of the window), from atlas, or as colored cells in level of detail mode.
+            gameOver is None while the game is played, or (won, explodedTile) to show the mines. The atlas is only used at the current tile size'''
+        firstRow, lastRow, firstCol, lastCol = self.visibleRange()
+        if gameOver is not None:
+            won, explodedTile = gameOver
+            exploded = np.zeros((lastRow - firstRow, lastCol - firstCol), dtype=bool)
+            if explodedTile is not None and firstRow <= explodedTile[0] < lastRow and firstCol <= explodedTile[1] < lastCol:
+                exploded[explodedTile[0] - firstRow, explodedTile[1] - firstCol] = True
+            gameOver = (won, exploded)
+        kinds = tileKinds(board.numbers[firstRow:lastRow, firstCol:lastCol], board.state[firstRow:lastRow, firstCol:lastCol], gameOver)
+
+        tilesize = self.tilesize
+        boardWidth, boardHeight = min(self.numCols * tilesize - self.x, self.width), min(self.numRows * tilesize - self.y, self.height)
+        if boardWidth < self.width or boardHeight < self.height:
+            surface.fill(BACKGROUND, (0, 0, self.width, self.height))
+
+        shades = np.add.outer(np.arange(firstRow, lastRow), np.arange(firstCol, lastCol)) % 2
+        if self.lod:
+            # one pixel per tile, made tilesize x tilesize, then cut down to the part in view. surfarray arrays are indexed [x, y]
+            pixels = LOD_COLORS[kinds, shades].transpose(1, 0, 2).repeat(tilesize, axis=0).repeat(tilesize, axis=1)
+            left, top = self.x - firstCol * tilesize, self.y - firstRow * tilesize
+            pygame.surfarray.blit_array(surface.subsurface((0, 0, boardWidth, boardHeight)), pixels[left:left + boardWidth, top:top + boardHeight])
+            return
+
+        surfaces = atlas.kinds
+        rows, cols = np.indices(kinds.shape).reshape(2, -1)
+        surface.blits([(surfaces[kind][shade], (col * tilesize - self.x, row * tilesize - self.y)) for kind, shade, row, col in
+                       zip(kinds.ravel().tolist(), shades.ravel().tolist(), (rows + firstRow).tolist(), (cols + firstCol).tolist())], False)
+
+
+
+    def drawGameOver(self, surface, atlas, board, mines, won, explodedTile):
+        ''' Show the mines of a game that just ended on surface, which already shows the board as it was played. The mines are the only tiles
+            that look different once the game is over (misplaced flags stay yellow), so only the ones in view are drawn, found in mines:
+            the flat indices (row * numCols + col) of every mine, as in Engine.mineLocations. Returns the amount of tiles drawn.
+            Without mines (a ChunkedBoard never knows all of them), or in level of detail mode where it costs the same, everything is drawn'''
+        if mines is None or self.lod:
+            self.draw(surface, atlas, board, (won, explodedTile))
+            return self.numVisible()
+
+        firstRow, lastRow, firstCol, lastCol = self.visibleRange()
+        rows, cols = np.divmod(np.asarray(mines), self.numCols)
+        visible = (rows >= firstRow) & (rows < lastRow) & (cols >= firstCol) & (cols < lastCol)
+        rows, cols = rows[visible], cols[visible]
+        exploded = (rows == explodedTile[0]) & (cols == explodedTile[1]) if explodedTile is not None else np.zeros(len(rows), dtype=bool)
+        kinds = tileKinds(board.numbers[rows, cols], board.state[rows, cols], (won, exploded))
+
+        surfaces, tilesize = atlas.kinds, self.tilesize
+        surface.blits([(surfaces[kind][(row + col) % 2], (col * tilesize - self.x, row * tilesize - self.y)) for kind, row, col in
+                       zip(kinds.tolist(), rows.tolist(), cols.tolist())], False)
+        return len(rows)
@@ -0,0 +1,223 @@
+import pygame
+
+
+
+''' A small retained-mode widget layer for the menus. Every widget renders itself to a surface once, and again only when its state changes,
+    so drawing a widget is always a single blit. A Screen is a list of widgets drawn once onto a surface of its own, which it keeps:
+    showing a Screen again is one blit and one flip, however many widgets are on it. After that, refresh() only draws the widgets whose
+    state changed and only updates those parts of the window, so a menu that is waiting on the user draws nothing at all.
+    Clicks are hit-tested against the widgets' rects, topmost first, instead of against hand-written coordinates'''
+
+class Widget():
+    def __init__(self, rect, onClick=None):
+        self.rect = pygame.Rect(rect)
+        self.onClick = onClick  # called with no arguments when the widget is clicked
+        self.surface = None
+        self.dirty = True
+
+
+
+    def render(self): # a surface the size of self.rect showing the widget in its current state
+        raise NotImplementedError
+
+
+
+    def changed(self): # call whenever the widget's state changes: it is rendered again the next time it is drawn
+        self.surface = None
+        self.dirty = True
+
+
+
+    def draw(self, target):
+        if self.surface is None:
+            self.surface = self.render()
+        target.blit(self.surface, self.rect)
+        self.dirty = False
+
+
+
+class Image(Widget): # a surface that was drawn some other way, such as another Screen's surface
+    def __init__(self, position, image, onClick=None):
+        super().__init__(image.get_rect(topleft=position), onClick)
+        self.image = image
+
+
+
+    def render(self):
+        return self.image
+
+
+
+class Label(Widget):
+    ''' One line of text. With a rect, the text is drawn at offset inside it on a background, so changing it with setText()
+        covers what was there before. Without one, the widget is as big as the text and placed at position with anchor (a pygame.Rect attribute)'''
+    def __init__(self, text, font, color, position=(0, 0), anchor='topleft', rect=None, background=None, offset=(0, 0), onClick=None):
+        self.text, self.font, self.color, self.background, self.offset = text, font, color, background, offset
+        if rect is None:
+            rect = font.render(text, True, color).get_rect(**{anchor: position})
+        super().__init__(rect, onClick)
+
+
+
+    def setText(self, text):
+        if text != self.text:
+            self.text = text
+            self.changed()
+
+
+
+    def render(self):
+        text = self.font.render(self.text, True, self.color, self.background)
+        if self.rect.size == text.get_size() and self.background is None:
+            return text
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA if self.background is None else 0)
+        if self.background is not None:
+            surface.fill(self.background)
+        surface.blit(text, self.offset)
+        return surface
+
+
+
+class Button(Widget):
+    ''' A box: filled with fill (or see-through if it's None), with a border of borderWidth pixels if border is given,
+        and text (if any) in its center, or right-aligned textPadding pixels from its right edge with alignRight'''
+    def __init__(self, rect, text='', font=None, textColor=(0, 0, 0), fill=None, border=None, borderWidth=1, onClick=None, alignRight=False, textPadding=(0, 0)):
+        super().__init__(rect, onClick)
+        self.text, self.font, self.textColor = text, font, textColor
+        self.fill, self.border, self.borderWidth = fill, border, borderWidth
+        self.alignRight, self.textPadding = alignRight, textPadding
+
+
+
+    def setText(self, text):
+        if text != self.text:
+            self.text = text
+            self.changed()
+
+
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        area = surface.get_rect()
+        if self.fill is not None:
+            surface.fill(self.fill)
+        if self.border is not None:
+            pygame.draw.rect(surface, self.border, area, self.borderWidth)
+        if self.text:
+            text = self.font.render(self.text, True, self.textColor)
+            if self.alignRight:
+                textRect = text.get_rect(topright=(area.right - self.textPadding[0], self.textPadding[1]))
+            else:
+                textRect = text.get_rect(center=area.center)
+            surface.blit(text, textRect)
+        return surface
+
+
+
+class TextBox(Button): # a Button that numbers can be typed into while it is selected (see Screen.keyPressed())
+    def __init__(self, rect, font, maximumDigits, text=''):
+        super().__init__(rect, text, font, fill=(255, 255, 255), border=(0, 0, 0), alignRight=True, textPadding=(3, 3))
+        self.maximumDigits = maximumDigits
+
+
+
+    def type(self, key): # what typing key does to the text: the digits are added up to maximumDigits (never a leading 0), backspace removes one
+        if pygame.K_1 <= key <= pygame.K_9 or key == pygame.K_0 and self.text:
+            if len(self.text) < self.maximumDigits:
+                self.setText(self.text + chr(key))
+        elif key == pygame.K_BACKSPACE:
+            self.setText(self.text[:-1])
+
+
+
+class Checkbox(Widget):
+    def __init__(self, rect, checked=False, onClick=None):
+        super().__init__(rect, onClick)
+        self.checked = checked
+
+
+
+    def setChecked(self, checked):
+        if checked != self.checked:
+            self.checked = checked
+            self.changed()
+
+
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size)
+        surface.fill((255, 255, 255))
+        pygame.draw.rect(surface, (0, 0, 0), surface.get_rect(), 1)
+        if self.checked:
+            pygame.draw.rect(surface, (0, 17, 255), surface.get_rect().inflate(-6, -6))
+        return surface
+
+
+
+class Screen():
+    def __init__(self, size, background, widgets):
+        self.size = size
+        self.background = background
+        self.widgets = widgets
+        self.surface = None     # every widget drawn on the background, kept from one showing to the next
+        self.selected = None    # the TextBox being typed into
+
+
+
+    def show(self, window): # draw the whole screen on the window, which only draws the widgets the first time (or the ones that changed)
+        if self.surface is None:
+            self.surface = pygame.Surface(self.size)
+            self.surface.fill(self.background)
+            for widget in self.widgets:
+                widget.draw(self.surface)
+        else:
+            self.drawChanged()
+        window.blit(self.surface, (0, 0))
+        pygame.display.flip()
+
+
+
+    def drawChanged(self): # draw the widgets that changed on the screen's surface, and return where they are. Widgets that change mustn't overlap others
+        dirtyRects = []
+        for widget in self.widgets:
+            if widget.dirty:
+                self.surface.fill(self.background, widget.rect)
+                widget.draw(self.surface)
+                dirtyRects.append(widget.rect)
+        return dirtyRects
+
+
+
+    def refresh(self, window): # show the widgets that changed since the last refresh() on the window, and update only those parts of it
+        dirtyRects = self.drawChanged()
+        for rect in dirtyRects:
+            window.blit(self.surface, rect, rect)
+        if dirtyRects:
+            pygame.display.update(dirtyRects)
+
+
+
+    def widgetAt(self, x, y): # the topmost widget at (x, y), or None
+        for widget in reversed(self.widgets):
+            if widget.rect.collidepoint(x, y):
+                return widget
+        return None
+
+
+
+    def click(self, x, y): # a left-click: select the TextBox clicked on (if any), and call the onClick of the widget clicked on
+        widget = self.widgetAt(x, y)
+        self.selected = widget if isinstance(widget, TextBox) else None
+        if widget is not None and widget.onClick is not None:
+            widget.onClick()
+
+
+
+    def keyPressed(self, key): # returns whether the key was used, by typing into the selected TextBox (Esc stops typing)
+        if self.selected is None:
+            return False
+        if key == pygame.K_ESCAPE:
+            self.selected = None
+        else:
+            self.selected.type(key)
+        return True
@@ -0,0 +1,248 @@
+''' Plays games in bulk with no display: every game is played by a policy, on as many processes as there are CPU cores.
+    Usage example:
+        python simulate.py --games 1000000 --preset beginner --preset expert --custom 20 40 120 --policy random --output results.bin
+    The results of every game are streamed to the output file as fixed-size binary records (see RESULT_DTYPE and readResults()),
+    and a win rate summary is printed at the end.
+
+    A policy is any function policy(engine, rng, changedTiles) that returns the next move as (action, row, col), where action is 'reveal', 'flag' or 'chord'.
+    It is called with the Engine before every move, with the tiles the previous move changed (None before the first click of a game).
+    A policy that needs to set itself up in each worker can be a class instead, which is instantiated once per worker.
+    --policy takes one of the names in POLICIES, or "module:function" for a policy defined somewhere else.
+
+    With --batch, every chunk of games is played side by side on a minesweeper.batch.BatchEngine, which makes one move on every board per call.
+    The policy is then batchPolicy(engine, rng, changed) and returns the next move of every board as (actions, rows, cols) arrays
+    (see BatchEngine.step()), with changed being what the last step returned. Only those in BATCH_POLICIES (or "module:function") can be used'''
+import argparse, importlib, json, os, struct, time
+import numpy as np
+from multiprocessing import Pool
+from minesweeper.engine import Engine, NOT_STARTED, PLAYING, WON
+from minesweeper.batch import BatchEngine, IDLE, REVEAL
+from minesweeper.board import OPENED, FLAGGED
+from minesweeper.solver import Solver
+from minesweeper.probability import ProbabilityEngine
+from minesweeper.noguess import NoGuessGenerator
+
+# the same difficulties as the difficulty menu, and the same limits as the Custom menu
+PRESETS = {'beginner': (10, 10, 15), 'intermediate': (15, 27, 80), 'expert': (24, 30, 155)}
+MIN_ROWS, MAX_ROWS = 10, 99
+MIN_COLS, MAX_COLS = 10, 99
+
+# one record per game. outcome is the Engine state the game ended in (LOST or WON), or PLAYING if the policy ran out of moves
+RESULT_DTYPE = np.dtype([('game', '<u8'), ('preset', 'u1'), ('outcome', 'u1'), ('moves', '<u4'), ('opened', '<u4')])
+MAGIC = b'MSIM'
+
+
+
+#######    POLICIES    #######
+def randomPolicy(engine, rng, changedTiles): # open a random tile that hasn't been opened or flagged. The first click is a random tile too
+    candidates = np.flatnonzero(engine.board.state & (OPENED | FLAGGED) == 0)
+    row, col = divmod(int(candidates[rng.integers(len(candidates))]), engine.numCols)
+    return 'reveal', row, col
+
+
+
+class SolverPolicy(): # click the middle first, then open whatever the Solver proves safe, and guess a random tile that isn't a known mine when it's stuck
+    def __call__(self, engine, rng, changedTiles):
+        if changedTiles is None:
+            self.solver = Solver(engine)
+            return 'reveal', engine.numRows // 2, engine.numCols // 2
+
+        self.solver.update(changedTiles)
+        if self.solver.safe:
+            row, col = divmod(next(iter(self.solver.safe)), engine.numCols)
+            return 'reveal', row, col
+        return 'reveal', *self.guess(engine, rng)
+
+
+
+    def guess(self, engine, rng):
+        candidates = np.flatnonzero(engine.board.state.ravel() & (OPENED | FLAGGED) == 0)
+        candidates = candidates[~np.isin(candidates, list(self.solver.mines))]
+        return divmod(int(candidates[rng.integers(len(candidates))]), engine.numCols)
+
+
+
+class ProbabilityPolicy(SolverPolicy): # the same as SolverPolicy, but when it's stuck it opens the tile least likely to be a mine
+    def guess(self, engine, rng):
+        if getattr(self, 'probabilityEngine', None) is None or self.probabilityEngine.solver is not self.solver:
+            self.probabilityEngine = ProbabilityEngine(self.solver, rng=rng)
+        probabilities = self.probabilityEngine.probabilities().ravel()
+        probabilities[engine.board.state.ravel() & (OPENED | FLAGGED) != 0] = 2
+        return divmod(int(np.argmin(probabilities)), engine.numCols)
+
+
+
+def batchRandomPolicy(engine, rng, changed): # randomPolicy() on every board of a BatchEngine at once: the closed tile with the highest random key
+    boards = np.flatnonzero(~engine.finished())
+    closed = (engine.boardState[boards] & (OPENED | FLAGGED) == 0).reshape(len(boards), -1)
+    actions, tiles = np.full(engine.numBoards, IDLE), np.zeros(engine.numBoards, dtype=np.int64)
+    actions[boards] = REVEAL
+    tiles[boards] = np.argmax(np.where(closed, rng.random(closed.shape, dtype=np.float32), -1), axis=1)
+    rows, cols = np.divmod(tiles, engine.numCols)
+    return actions, rows, cols
+
+
+
+POLICIES = {'random': randomPolicy, 'solver': SolverPolicy, 'probability': ProbabilityPolicy}
+BATCH_POLICIES = {'random': batchRandomPolicy}
+
+
+
+def loadPolicy(name, batch=False):
+    policies = BATCH_POLICIES if batch else POLICIES
+    if name in policies:
+        policy = policies[name]
+    else:
+        moduleName, _, functionName = name.partition(':')
+        if not functionName:
+            raise ValueError('unknown %spolicy %r: use one of %s, or module:function' % ('batch ' if batch else '', name, ', '.join(sorted(policies))))
+        policy = getattr(importlib.import_module(moduleName), functionName)
+    return policy() if isinstance(policy, type) else policy
+
+
+
+#######    WORKERS    #######
+def playGame(engine, policy, rng, maxMoves): # play one game on an Engine that has just been reset, and return (outcome, moves, tiles opened)
+    moves = 0
+    changedTiles = None
+    while engine.state in (NOT_STARTED, PLAYING) and moves < maxMoves:
+        action, row, col = policy(engine, rng, changedTiles)
+        changedTiles = getattr(engine, action)(row, col)
+        moves += 1
+    opened = engine.numRows * engine.numCols - engine.numMines - engine.numTilesRemaining
+    return engine.state, moves, opened
+
+
+
+def playBatch(engine, policy, rng, maxMoves): # playGame() on every board of a BatchEngine that has just been reset, returning arrays
+    moves = np.zeros(engine.numBoards, dtype=np.int64)
+    changed = None
+    while True:
+        playing = (engine.state <= PLAYING) & (moves < maxMoves)
+        if not playing.any():
+            break
+        actions, rows, cols = policy(engine, rng, changed)
+        changed = engine.step(np.where(playing, actions, IDLE), rows, cols)
+        moves += playing
+    opened = engine.numRows * engine.numCols - engine.numMines - engine.numTilesRemaining
+    return engine.state, moves, opened
+
+
+
+def playChunk(task): # runs in a worker process: plays `count` games of one difficulty, numbered from firstGame, seeded by seedSequence
+    presetIndex, (numRows, numCols, numMines), firstGame, count, seedSequence, policyName, noGuess, batch = task
+    policy = loadPolicy(policyName, batch)
+    rng = np.random.default_rng(seedSequence)
+    engine = BatchEngine(count, numRows, numCols, numMines) if batch else Engine(numRows, numCols, numMines)
+    engine.rng = rng
+    if noGuess:
+        engine.mineGenerator = NoGuessGenerator()
+    maxMoves = numRows * numCols * 4  # a policy that keeps making useless moves still ends its game
+
+    results = np.zeros(count, dtype=RESULT_DTYPE)
+    if batch:
+        engine.reset()
+        outcomes, moves, opened = playBatch(engine, policy, rng, maxMoves)
+        results['game'], results['preset'] = np.arange(firstGame, firstGame + count), presetIndex
+        results['outcome'], results['moves'], results['opened'] = outcomes, moves, opened
+        return results.tobytes()
+
+    for i in range(count):
+        engine.reset()
+        outcome, moves, opened = playGame(engine, policy, rng, maxMoves)
+        results[i] = (firstGame + i, presetIndex, outcome, moves, opened)
+    return results.tobytes()
+
+
+
+#######    RESULTS FILE    #######
+def writeHeader(file, difficulties, policyName, seed, noGuess):
+    header = json.dumps({'difficulties': difficulties, 'policy': policyName, 'seed': seed, 'noGuess': noGuess, 'dtype': RESULT_DTYPE.descr}).encode()
+    file.write(MAGIC + struct.pack('<I', len(header)) + header)
+
+
+
+def readResults(path, chunkSize=1 << 20):
+    ''' Reads a results file written by run(). Returns (header, records) where header is the dict written by writeHeader()
+        and records is a generator of numpy arrays of RESULT_DTYPE, at most chunkSize records each, so huge files never have to fit in memory'''
+    file = open(path, 'rb')
+    if file.read(4) != MAGIC:
+        file.close()
+        raise ValueError('%s is not a simulation results file' % path)
+    header = json.loads(file.read(struct.unpack('<I', file.read(4))[0]))
+
+    def records():
+        with file:
+            while True:
+                chunk = np.fromfile(file, dtype=RESULT_DTYPE, count=chunkSize)
+                if not len(chunk):
+                    return
+                yield chunk
+    return header, records()
+
+
+
+#######    RUNNER    #######
+def run(difficulties, numGames, policyName='random', seed=None, workers=None, output='results.bin', chunkSize=1000, noGuess=False, batch=False):
+    ''' Plays numGames games of each (numRows, numCols, numMines) in difficulties, streaming every result to output.
+        With noGuess, every board is one that can be finished without guessing (see noguess.NoGuessGenerator).
+        With batch, the games of each chunk are played together on a BatchEngine by a batch policy.
+        Every chunk of chunkSize games gets its own seed spawned from seed, so the same seed gives the same games no matter how many workers there are.
+        Returns a list of (games played, games won) per difficulty'''
+    loadPolicy(policyName, batch)  # fail here, not in every worker
+    seed = seed if seed is not None else int(np.random.SeedSequence().entropy % (1 << 63))
+    tasks = []
+    for presetIndex, difficulty in enumerate(difficulties):
+        firstGames = range(0, numGames, chunkSize)
+        seeds = np.random.SeedSequence([seed, presetIndex]).spawn(len(firstGames))
+        tasks += [(presetIndex, difficulty, firstGame, min(chunkSize, numGames - firstGame), chunkSeed, policyName, noGuess, batch) for firstGame, chunkSeed in zip(firstGames, seeds)]
+
+    totals = [[0, 0] for difficulty in difficulties]
+    with open(output, 'wb') as file, Pool(workers) as pool:
+        writeHeader(file, [list(difficulty) for difficulty in difficulties], policyName, seed, noGuess)
+        for chunk in pool.imap_unordered(playChunk, tasks):
+            file.write(chunk)
+            results = np.frombuffer(chunk, dtype=RESULT_DTYPE)
+            totals[results['preset'][0]][0] += len(results)
+            totals[results['preset'][0]][1] += int((results['outcome'] == WON).sum())
+    return totals
+
+
+
+def parseDifficulties(args):
+    difficulties = [PRESETS[name] for name in args.preset or []]
+    for numRows, numCols, numMines in args.custom or []:
+        if not (MIN_ROWS <= numRows <= MAX_ROWS and MIN_COLS <= numCols <= MAX_COLS and 1 <= numMines <= numRows * numCols - 10):
+            raise SystemExit('custom difficulty %dx%d with %d mines is outside of the Custom menu limits' % (numRows, numCols, numMines))
+        difficulties.append((numRows, numCols, numMines))
+    return difficulties or list(PRESETS.values())
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play Minesweeper games in bulk with no display.')
+    parser.add_argument('--games', type=int, default=10000, help='games to play per difficulty')
+    parser.add_argument('--preset', action='append', choices=sorted(PRESETS), help='can be given more than once (default: all three)')
+    parser.add_argument('--custom', action='append', nargs=3, type=int, metavar=('ROWS', 'COLS', 'MINES'), help='can be given more than once')
+    parser.add_argument('--policy', default='random', help='one of %s, or module:function' % ', '.join(sorted(POLICIES)))
+    parser.add_argument('--seed', type=int, help='seed for the whole run (default: random)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: one per CPU core)')
+    parser.add_argument('--chunk', type=int, default=1000, help='games per task sent to a worker')
+    parser.add_argument('--output', default='results.bin', help='results file')
+    parser.add_argument('--no-guess', action='store_true', help='only play boards that can be finished without guessing')
+    parser.add_argument('--batch', action='store_true', help='play the games of each chunk side by side on a BatchEngine (batch policies: %s)' % ', '.join(sorted(BATCH_POLICIES)))
+    args = parser.parse_args(argv)
+
+    difficulties = parseDifficulties(args)
+    start = time.perf_counter()
+    totals = run(difficulties, args.games, args.policy, args.seed, args.workers, args.output, args.chunk, args.no_guess, args.batch)
+    elapsed = time.perf_counter() - start
+
+    for (numRows, numCols, numMines), (played, won) in zip(difficulties, totals):
+        print('%dx%d, %d mines: %d/%d won (%.2f%%)' % (numRows, numCols, numMines, won, played, 100 * won / played if played else 0))
+    print('%d games in %.1f s (%.0f games/s)' % (sum(played for played, won in totals), elapsed, sum(played for played, won in totals) / elapsed))
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import numpy as np
+from minesweeper.engine import Engine
+from minesweeper.replay import ReplayWriter, readReplays, REVEAL, FLAG
+
+
+
+def play(engine, moves, writer=None): # make every move on the Engine, and record it like Gameboard does if given a writer
+    for timestamp, (action, row, col) in enumerate(moves):
+        getattr(engine, {REVEAL: 'reveal', FLAG: 'flag'}[action])(row, col)
+        if writer is not None:
+            writer.record(engine, action, row, col, timestamp)
+
+
+
+def test_flag_before_first_click(tmp_path): # a flag stops the opening cascade, so it has to be replayed before the first click
+    path = tmp_path / 'replays.bin'
+    engine = Engine(16, 30, 99)
+    engine.reset(seed=0)
+    writer = ReplayWriter(path)
+    play(engine, [(FLAG, 5, 6), (REVEAL, 5, 8)], writer)
+    writer.close()
+
+    replay = list(readReplays(path))[-1]
+    assert [action for timestamp, action, row, col in replay.actions] == ['flag', 'reveal']
+    replayed = replay.engineAt()
+    assert np.array_equal(replayed.board.state, engine.board.state)
+    assert replayed.numMinesRemaining == engine.numMinesRemaining and replayed.numTilesRemaining == engine.numTilesRemaining
+
+
+
+def test_held_back_moves_of_an_abandoned_game(tmp_path): # flags of a game that never got its first click don't end up in the next game
+    path = tmp_path / 'replays.bin'
+    engine = Engine(16, 30, 99)
+    writer = ReplayWriter(path, snapshotInterval=2)
+    engine.reset(seed=1)
+    play(engine, [(FLAG, 0, 0)], writer)
+    engine.reset(seed=2)
+    moves = [(FLAG, 3, 3), (REVEAL, 8, 15), (FLAG, 3, 3), (FLAG, 4, 4)]
+    play(engine, moves, writer)
+    writer.close()
+
+    replays = list(readReplays(path))
+    assert len(replays) == 1 and replays[0].seed == 2 and replays[0].finished
+    assert [(row, col) for timestamp, action, row, col in replays[0].actions] == [(row, col) for action, row, col in moves]
+    for move in range(5):  # with snapshots after moves 2 and 4
+        replayed = replays[0].engineAt(move)
+        engine.reset(seed=2)
+        play(engine, moves[:move])
+        assert np.array_equal(replayed.board.state, engine.board.state)